@@ -1,16 +1,41 @@
+import asyncio
+import base64
+import binascii
+import contextlib
+import hashlib
+import json
+import re
+import uuid
+import zlib
 from datetime import datetime, timezone
-from enum import Enum
-from typing import List, Any, Dict
+from typing import List, Any, AsyncIterator, Dict, Iterable, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from pydantic import ConfigDict, Field
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from sqlalchemy import DateTime, Float, Select, and_, bindparam, cast, false, func, insert, literal, literal_column, or_, select, true, tuple_, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql import column, table
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from jobs_data_contracts.jobs import models as dc_models
 
-from app.database import get_db
-from app.models import JobModel
-from app.queue import Operation, QueuePublisher, get_queue_publisher
+from app.cache import JobResponseCache, get_job_cache
+from app.changes import next_change_seq, visible_changes
+from app.database import AsyncSessionLocal, get_async_db
+from app.facets import (
+    FACET_SOURCE_COLUMNS,
+    apply_facet_deltas,
+    facet_counts,
+    facet_deltas,
+    old_facet_values_query,
+)
+from app.geo import jobs_within, replace_job_locations
+from app.models import JobArchiveModel, JobModel
+from app.outbox import add_outbox_message, add_outbox_messages
+from app.queue import Operation
 
 
 class JobCreatePayload(dc_models.JobCreate):
@@ -35,6 +60,17 @@ class JobResponse(dc_models.Job):
     model_config = ConfigDict(populate_by_name=True)
 
 
+class JobChangeResponse(JobResponse):
+    """Job as of its latest change, with that change's position in the feed.
+
+    ``archived`` marks a tombstone: the job closed and was moved out of the
+    live catalogue, and the document is its final state.
+    """
+
+    change_seq: int = Field(..., alias="changeSeq")
+    archived: bool = False
+
+
 class JobSummaryResponse(dc_models.JobSummary):
     """Job summary response including version."""
 
@@ -42,8 +78,57 @@ class JobSummaryResponse(dc_models.JobSummary):
     model_config = ConfigDict(populate_by_name=True)
 
 
+class JobNearbyResponse(JobSummaryResponse):
+    """Job summary with its distance from the search point."""
+
+    distance_km: float = Field(..., alias="distanceKm")
+
+
+class JobFacetValue(BaseModel):
+    """One value of a facet and the number of open jobs that have it."""
+
+    value: str
+    count: int
+
+
+class JobBatchItemResult(BaseModel):
+    """Outcome of one item of a POST /jobs:batch request."""
+
+    index: int
+    external_id: str | None = Field(None, alias="externalId")
+    status: int
+    id: str | None = None
+    version: int | None = None
+    detail: Any = None
+    model_config = ConfigDict(populate_by_name=True)
+
+
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Rows fetched per server-side cursor round-trip when streaming the full list.
+STREAM_BATCH_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Favour throughput over ratio: at level 1 compression keeps up with COPY.
+EXPORT_GZIP_LEVEL = 1
+# COPY output chunks buffered ahead of the client; bounds export memory.
+EXPORT_QUEUE_DEPTH = 16
+MAX_BATCH_SIZE = 5000
+DEFAULT_RADIUS_KM = 25.0
+# Bounds the bounding-box candidate set the database ranks for each page.
+MAX_RADIUS_KM = 200.0
+
+# Only the columns needed to build a JobSummaryResponse; large Text/JSON columns are never loaded for lists.
+SUMMARY_COLUMNS = (
+    JobModel.id,
+    JobModel.version,
+    JobModel.external_id,
+    JobModel.title,
+    JobModel.approach,
+    JobModel.closing_date,
+)
+
 FIELD_MAP = {
     "externalId": "external_id",
     "assignmentType": "assignment_type",
@@ -71,30 +156,47 @@ FIELD_MAP = {
 }
 
 
-def _to_plain(value: Any) -> Any:
-    """Convert pydantic/enums into JSON/DB-friendly structures."""
-    if value is None:
-        return None
-    if isinstance(value, Enum):
-        return value.value
-    if hasattr(value, "model_dump"):
-        return value.model_dump(mode="json", by_alias=True)
-    if isinstance(value, list):
-        return [_to_plain(item) for item in value]
-    if isinstance(value, dict):
-        return {k: _to_plain(v) for k, v in value.items()}
-    if isinstance(value, datetime):
-        return value
-    return str(value) if not isinstance(value, (str, int, float, bool)) else value
+class _PayloadNormalizer:
+    """Builds the JobModel column dict for one payload model.
+
+    The alias-to-column map is computed once per model at import time, and a
+    single ``model_dump(mode="json")`` pass turns enums, URLs, e-mails and
+    nested models into plain values. DateTime columns are read straight from
+    the model so the database driver still receives ``datetime`` objects;
+    they are converted to UTC because SQLite drops the offset on storage, and
+    facet day buckets built from a payload must match the stored row's.
+    """
+
+    def __init__(self, model: type[dc_models.BaseModel]):
+        datetime_columns = {col.name for col in JobModel.__table__.columns if isinstance(col.type, DateTime)}
+        self.columns: Dict[str, str] = {}
+        self.datetime_fields: Dict[str, str] = {}
+        for name, field in model.model_fields.items():
+            alias = field.alias or name
+            attr = FIELD_MAP.get(alias, alias)
+            if attr in datetime_columns:
+                self.datetime_fields[name] = attr
+            else:
+                self.columns[alias] = attr
+        self.exclude = frozenset(self.datetime_fields)
+
+    def __call__(self, payload: dc_models.BaseModel, *, exclude_unset: bool = False) -> Dict[str, Any]:
+        raw = payload.model_dump(mode="json", by_alias=True, exclude_unset=exclude_unset, exclude=self.exclude)
+        columns = self.columns
+        normalized = {columns[key]: value for key, value in raw.items()}
+        fields_set = payload.model_fields_set
+        for name, attr in self.datetime_fields.items():
+            if not exclude_unset or name in fields_set:
+                value = getattr(payload, name)
+                normalized[attr] = _to_utc(value) if value is not None else None
+        return normalized
+
+
+_NORMALIZERS = {model: _PayloadNormalizer(model) for model in (JobCreatePayload, JobUpdatePayload)}
 
 
 def _normalize_payload(payload: dc_models.BaseModel, *, exclude_unset: bool = False) -> Dict[str, Any]:
-    raw = payload.model_dump(by_alias=True, exclude_unset=exclude_unset)
-    normalized: Dict[str, Any] = {}
-    for key, value in raw.items():
-        column = FIELD_MAP.get(key, key)
-        normalized[column] = _to_plain(value)
-    return normalized
+    return _NORMALIZERS[type(payload)](payload, exclude_unset=exclude_unset)
 
 
 def _ensure_tz(value: datetime | None) -> datetime | None:
@@ -103,7 +205,31 @@ def _ensure_tz(value: datetime | None) -> datetime | None:
     return value
 
 
+# Columns that identify or track a job rather than describe it.
+_NON_CONTENT_COLUMNS = frozenset({"id", "external_id", "version", "change_seq", "content_hash"})
+
+
+def _content_hash(values: Dict[str, Any]) -> str:
+    """SHA-256 of a full normalised payload's content columns, for ``JobModel.content_hash``."""
+    content = {key: value for key, value in values.items() if key not in _NON_CONTENT_COLUMNS}
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=_json_datetime)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _stored_equals(stored: Any, value: Any) -> bool:
+    if isinstance(stored, datetime) and isinstance(value, datetime):
+        return _ensure_tz(stored) == _ensure_tz(value)
+    return stored == value
+
+
+def _to_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
 def _job_model_to_response(job_model: JobModel) -> JobResponse:
+    """Validating conversion to JobResponse; the reference for ``_job_json``."""
     payload = {
         "id": job_model.id,
         "version": job_model.version,
@@ -146,60 +272,935 @@ def _job_model_to_response(job_model: JobModel) -> JobResponse:
     return JobResponse.model_validate(payload)
 
 
-@router.get("/jobs", response_model=List[JobSummaryResponse])
-def get_all_jobs(db: Session = Depends(get_db)):
-    jobs = db.query(JobModel).all()
-    summaries = []
-    for job in jobs:
-        summary = {
-            "id": job.id,
-            "version": job.version,
-            "externalId": job.external_id,
-            "title": job.title,
-            "approach": job.approach,
-            "dateClosing": _ensure_tz(job.closing_date),
-        }
-        summaries.append(JobSummaryResponse.model_validate(summary))
-    return summaries
+# Precomputed (output alias, ORM attribute) pairs in response field order, so
+# trusted ORM rows are encoded straight to JSON without a Pydantic round-trip.
+_JOB_JSON_FIELDS = tuple(
+    (field.alias or name, "closing_date" if name == "date_closing" else name)
+    for name, field in JobResponse.model_fields.items()
+)
+_CHANGE_JSON_FIELDS = tuple(
+    (field.alias or name, "closing_date" if name == "date_closing" else name)
+    for name, field in JobChangeResponse.model_fields.items()
+)
+_SUMMARY_JSON_FIELDS = tuple(
+    (field.alias or name, "closing_date" if name == "date_closing" else name)
+    for name, field in JobSummaryResponse.model_fields.items()
+)
+# camelCase name -> JobModel attribute for every Job field; validates ``fields=`` (see FIELD_MAP).
+_JOB_FIELD_ATTRIBUTES = dict(_JOB_JSON_FIELDS)
+_DATETIME_ATTRIBUTES = frozenset({"date_posted", "closing_date"})
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _json_datetime(value: datetime | None) -> str | None:
+    """Format a datetime exactly as Pydantic's JSON mode does ('Z' for UTC)."""
+    if value is None:
+        return None
+    text = _ensure_tz(value).isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _row_to_document(row, fields) -> Dict[str, Any]:
+    document = {}
+    for alias, attribute in fields:
+        value = getattr(row, attribute)
+        document[alias] = _json_datetime(value) if attribute in _DATETIME_ATTRIBUTES else value
+    return document
+
+
+def _job_json(job) -> bytes:
+    """Encode a stored job as a JobResponse JSON document.
+
+    Stored values were validated and normalised on write, so they are emitted
+    as-is; ``_job_model_to_response`` remains the validating reference path.
+    """
+    return _encode_json(_row_to_document(job, _JOB_JSON_FIELDS)).encode()
+
+
+def _summaries_json(rows, fields=_SUMMARY_JSON_FIELDS) -> bytes:
+    return _encode_json([_row_to_document(row, fields) for row in rows]).encode()
+
+
+def _parse_fields(fields: str) -> Tuple[Tuple[str, str], ...]:
+    """Validate a ``fields=`` list of camelCase Job field names.
+
+    Returns the matching (alias, attribute) pairs in document order.
+    """
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - _JOB_FIELD_ATTRIBUTES.keys()
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}" if unknown else "fields must not be empty",
+        )
+    return tuple(pair for pair in _JOB_JSON_FIELDS if pair[0] in requested)
+
+
+def _list_projection(fields: str | None) -> Tuple[Tuple, Tuple[Tuple[str, str], ...]]:
+    """Columns to select and (alias, attribute) pairs to emit for a page of jobs."""
+    if fields is None:
+        return SUMMARY_COLUMNS, _SUMMARY_JSON_FIELDS
+    selected = _parse_fields(fields)
+    # id and closing_date make up the keyset cursor; id and version the page ETag.
+    attributes = dict.fromkeys(["id", "closing_date", "version", *(attribute for _, attribute in selected)])
+    return tuple(getattr(JobModel, attribute) for attribute in attributes), selected
+
+
+def _job_json_response(job, *, status_code: int = status.HTTP_200_OK, headers: Dict[str, str] | None = None) -> Response:
+    return Response(content=_job_json(job), status_code=status_code, media_type="application/json", headers=headers)
+
+
+def _encode_cursor(closing_date: datetime, job_id: str) -> str:
+    """Build an opaque page cursor from the (closing_date, id) keyset position."""
+    raw = json.dumps([closing_date.isoformat(), job_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        closing_date, job_id = json.loads(raw)
+        return datetime.fromisoformat(closing_date), str(uuid.UUID(job_id))
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _encode_score_cursor(score: float, job_id: str) -> str:
+    """Build an opaque cursor from the (score, id) position of the last result (search rank, distance)."""
+    raw = json.dumps([score, job_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_score_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, job_id = json.loads(raw)
+        return float(score), str(uuid.UUID(job_id))
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _summary_row_to_response(row) -> JobSummaryResponse:
+    """Validating conversion to JobSummaryResponse; the reference for ``_summaries_json``."""
+    summary = {
+        "id": row.id,
+        "version": row.version,
+        "externalId": row.external_id,
+        "title": row.title,
+        "approach": row.approach,
+        "dateClosing": _ensure_tz(row.closing_date),
+    }
+    return JobSummaryResponse.model_validate(summary)
+
+
+async def _stream_summaries_ndjson(
+    approach: dc_models.Approach | None,
+    date_closing: datetime | None,
+    cursor: str | None,
+    projection: Tuple[Tuple, Tuple[Tuple[str, str], ...]] = (SUMMARY_COLUMNS, _SUMMARY_JSON_FIELDS),
+) -> AsyncIterator[bytes]:
+    """Yield one JSON line per job, reading rows through a server-side cursor.
+
+    Uses its own session because the response body is produced after the
+    request-scoped ``get_async_db`` session may already have been closed.
+    """
+    columns, fields = projection
+    statement = _filtered_summary_query(approach=approach, date_closing=date_closing, cursor=cursor, columns=columns)
+    statement = statement.order_by(JobModel.closing_date, JobModel.id).execution_options(yield_per=STREAM_BATCH_SIZE)
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(statement)
+        async for row in result:
+            yield _encode_json(_row_to_document(row, fields)).encode() + b"\n"
+
+
+def _pg_json_datetime(column_name: str) -> str:
+    """SQL rendering a timestamptz column exactly like ``_json_datetime``."""
+    utc = f"({column_name} AT TIME ZONE 'UTC')"
+    return (
+        f"""to_char({utc}, 'YYYY-MM-DD"T"HH24:MI:SS') || """
+        f"CASE WHEN date_trunc('second', {utc}) = {utc} THEN '' ELSE to_char({utc}, '.US') END || 'Z'"
+    )
+
+
+def _export_copy_sql() -> str:
+    """COPY source query that renders each job as its JobResponse document inside Postgres."""
+    pairs = ", ".join(
+        f"'{alias}', {_pg_json_datetime(attribute) if attribute in _DATETIME_ATTRIBUTES else attribute}"
+        for alias, attribute in _JOB_JSON_FIELDS
+    )
+    # Archived rows shadowed by a re-created live job with the same externalId are left out.
+    return (
+        f"SELECT json_build_object({pairs}) FROM jobs UNION ALL "
+        f"SELECT json_build_object({pairs}) FROM jobs_archive WHERE NOT EXISTS "
+        "(SELECT 1 FROM jobs WHERE jobs.external_id = jobs_archive.external_id)"
+    )
+
+
+async def _export_lines_postgres(db: AsyncSession) -> AsyncIterator[bytes]:
+    """Yield NDJSON chunks straight from ``COPY ... TO STDOUT``.
+
+    CSV format with control characters as quote and delimiter passes the JSON
+    text through unescaped. The bounded queue makes COPY wait for the client.
+    """
+    connection = await db.connection()
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=EXPORT_QUEUE_DEPTH)
+
+    async def copy() -> None:
+        try:
+            await driver_connection.copy_from_query(
+                _export_copy_sql(), output=chunks.put, format="csv", delimiter="\x02", quote="\x01"
+            )
+        except Exception as exc:
+            await chunks.put(exc)
+            return
+        await chunks.put(None)
+
+    task = asyncio.create_task(copy())
+    finished = False
+    try:
+        while (chunk := await chunks.get()) is not None:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+        finished = True
+    finally:
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if not finished:
+            # The COPY was abandoned midway; never hand this connection back to the pool.
+            await connection.invalidate()
+
+
+async def _export_lines_chunked(db: AsyncSession) -> AsyncIterator[bytes]:
+    """Yield NDJSON chunks of STREAM_BATCH_SIZE jobs read through a server-side cursor."""
+    aliases = [alias for alias, _ in _JOB_JSON_FIELDS]
+    datetime_aliases = [alias for alias, attribute in _JOB_JSON_FIELDS if attribute in _DATETIME_ATTRIBUTES]
+    live = select(*(getattr(JobModel, attribute) for _, attribute in _JOB_JSON_FIELDS))
+    # Archived rows shadowed by a re-created live job with the same externalId are left out.
+    archived = select(*(getattr(JobArchiveModel, attribute) for _, attribute in _JOB_JSON_FIELDS)).where(
+        ~select(JobModel.id).where(JobModel.external_id == JobArchiveModel.external_id).exists()
+    )
+    for statement in (live, archived):
+        result = await db.stream(statement.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for rows in result.partitions():
+            lines = []
+            for row in rows:
+                # Positional unpacking: per-attribute Row lookups dominate at export volumes.
+                document = dict(zip(aliases, row))
+                for alias in datetime_aliases:
+                    document[alias] = _json_datetime(document[alias])
+                lines.append(_encode_json(document))
+            yield ("\n".join(lines) + "\n").encode()
+
+
+async def stream_jobs_export(level: int = EXPORT_GZIP_LEVEL) -> AsyncIterator[bytes]:
+    """Yield every job, archived ones included, as a gzip-compressed NDJSON stream of JobResponse documents.
+
+    Documents are built by Postgres via COPY, or from a chunked cursor on
+    other databases. Memory stays bounded by the chunk sizes, whatever the
+    table size. Uses its own session, like ``_stream_summaries_ndjson``.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async with AsyncSessionLocal() as db:
+        lines = _export_lines_postgres if db.get_bind().dialect.name == "postgresql" else _export_lines_chunked
+        async for chunk in lines(db):
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+    yield compressor.flush()
+
+
+def _filtered_summary_query(
+    *,
+    approach: dc_models.Approach | None,
+    date_closing: datetime | None,
+    cursor: str | None,
+    columns: Tuple = SUMMARY_COLUMNS,
+) -> Select:
+    statement = select(*columns)
+    if approach is not None:
+        statement = statement.where(JobModel.approach == approach.value)
+    if date_closing is not None:
+        statement = statement.where(JobModel.closing_date >= _to_utc(date_closing))
+    if cursor is not None:
+        statement = statement.where(tuple_(JobModel.closing_date, JobModel.id) > _decode_cursor(cursor))
+    return statement
+
+
+_SEARCH_TOKEN = re.compile(r"\w+")
+# SQLite FTS5 index over jobs, maintained by triggers (see app.models).
+_JOBS_FTS = table("jobs_fts", column("rowid"))
+
+
+def _search_query(dialect: str, q: str) -> Tuple[Select, Any] | None:
+    """Ranked full-text match over title, summary, organisation and description.
+
+    Returns ``(statement, rank)`` where higher ranks are better, or ``None``
+    when ``q`` has no searchable terms. Postgres reads the GIN-indexed
+    ``search_vector`` column; SQLite joins the ``jobs_fts`` FTS5 table.
+    """
+    if dialect == "postgresql":
+        tsquery = func.websearch_to_tsquery("english", q)
+        vector = literal_column("jobs.search_vector")
+        # float8 so the rank round-trips through the cursor exactly.
+        rank = cast(func.ts_rank_cd(vector, tsquery), Float)
+        return select(*SUMMARY_COLUMNS, rank.label("rank")).where(vector.op("@@")(tsquery)), rank
+
+    # FTS5 query syntax chokes on arbitrary punctuation, so match each word as a quoted term (implicit AND).
+    terms = _SEARCH_TOKEN.findall(q)
+    if not terms:
+        return None
+    match = " ".join(f'"{term}"' for term in terms)
+    # bm25() is lower-is-better; the column weights mirror the Postgres setweight() classes.
+    rank = literal_column("-bm25(jobs_fts, 10.0, 5.0, 1.0, 5.0)", Float)
+    statement = (
+        select(*SUMMARY_COLUMNS, rank.label("rank"))
+        .join_from(JobModel, _JOBS_FTS, _JOBS_FTS.c.rowid == literal_column("jobs.rowid"))
+        .where(literal_column("jobs_fts").op("MATCH")(match))
+    )
+    return statement, rank
+
+
+def _not_found(external_id: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job with externalId '{external_id}' not found")
+
+
+async def _get_job_or_404(
+    db: AsyncSession,
+    external_id: str,
+    attributes: Iterable[str] | None = None,
+    *,
+    include_archived: bool = False,
+) -> JobModel:
+    """Load a job by externalId; with ``attributes``, only those columns (plus the key) are selected.
+
+    ``include_archived`` falls back to ``jobs_archive`` (see ``app.archive``); writes leave it off.
+    """
+    for model in (JobModel, JobArchiveModel) if include_archived else (JobModel,):
+        statement = select(model).where(model.external_id == external_id)
+        if attributes is not None:
+            statement = statement.options(load_only(*(getattr(model, attribute) for attribute in attributes)))
+        result = await db.execute(statement)
+        job = result.scalars().first()
+        if job is not None:
+            return job
+    raise _not_found(external_id)
+
+
+def _job_etag(job_id: str, version: int) -> str:
+    return f'"{job_id}.{version}"'
+
+
+def _etag_matches(header: str, etag: str, *, weak: bool) -> bool:
+    """Evaluate an If-Match (strong) or If-None-Match (weak) header against ``etag``."""
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _is_job_id(value: str) -> bool:
+    # Ids are native UUIDs in Postgres; anything else must not reach a bind parameter.
+    try:
+        return str(uuid.UUID(value)) == value
+    except ValueError:
+        return False
+
+
+def _if_match_clause(if_match: str):
+    """Translate an If-Match header into a WHERE clause on (id, version).
+
+    Strong comparison: weak or malformed tags never match, ``*`` matches any
+    existing job.
+    """
+    if if_match.strip() == "*":
+        return true()
+    clauses = []
+    for candidate in if_match.split(","):
+        candidate = candidate.strip()
+        if not (len(candidate) > 2 and candidate[0] == candidate[-1] == '"'):
+            continue
+        job_id, _, version = candidate[1:-1].rpartition(".")
+        if _is_job_id(job_id) and version.isdigit():
+            clauses.append(and_(JobModel.id == job_id, JobModel.version == int(version)))
+    return or_(*clauses) if clauses else false()
+
+
+def _update_statement(dialect: str, external_id: str, values: Dict[str, Any], *, old_facets: bool = False):
+    statement = (
+        update(JobModel)
+        .values(**values, version=JobModel.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if not (old_facets and dialect == "postgresql"):
+        return statement.where(JobModel.external_id == external_id).returning(JobModel)
+    # UPDATE ... FROM (SELECT ... FOR UPDATE) old RETURNING old.*: the replaced values come back with the new row.
+    old = old_facet_values_query(external_id).subquery("old")
+    return statement.where(JobModel.id == old.c.id).returning(
+        JobModel, *(old.c[column].label(f"old_{column}") for column in FACET_SOURCE_COLUMNS)
+    )
+
+
+async def _update_returning(
+    db: AsyncSession,
+    external_id: str,
+    values: Dict[str, Any],
+    if_match: str | None,
+    *,
+    old_facets: bool = False,
+) -> Tuple[JobModel, Dict[str, Any] | None]:
+    """Apply ``values`` and bump the version in one UPDATE ... RETURNING statement.
+
+    The version increment happens in SQL, so concurrent writers can never
+    lose each other's updates; If-Match becomes part of the WHERE clause.
+    With ``old_facets`` the job's previous facet source columns are returned
+    too. On Postgres they come from the UPDATE itself. SQLite cannot return
+    columns of an ``UPDATE ... FROM`` source, so there they are read first;
+    SQLite allows only one writer at a time, so nothing can change in between.
+    """
+    dialect = db.get_bind().dialect.name
+    old = None
+    if old_facets and dialect != "postgresql":
+        old = (await db.execute(old_facet_values_query(external_id))).first()
+    statement = _update_statement(dialect, external_id, values, old_facets=old_facets)
+    if if_match is not None:
+        statement = statement.where(_if_match_clause(if_match))
+    row = (await db.execute(statement)).first()
+    if row is None:
+        await _raise_write_precondition(db, external_id, if_match)
+    if old_facets and dialect == "postgresql":
+        old = {column: getattr(row, f"old_{column}") for column in FACET_SOURCE_COLUMNS}
+    return row[0], old
+
+
+async def _raise_write_precondition(db: AsyncSession, external_id: str, if_match: str | None) -> None:
+    """Explain why a conditional write matched no row: 404 if missing, else 412."""
+    await db.rollback()
+    result = await db.execute(select(JobModel.id).where(JobModel.external_id == external_id))
+    if result.first() is None or if_match is None:
+        raise _not_found(external_id)
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Job has been modified; If-Match does not match the current ETag",
+    )
+
+
+def _page_etag(rows, has_next: bool) -> str:
+    """Collection ETag for one page of ``GET /jobs``, from values the page query already read.
+
+    Every write bumps a job's version, so the page's ``(id, version)`` pairs
+    and whether a next page exists determine the whole response.
+    """
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(f"{row.id}.{row.version};".encode())
+    digest.update(b"next" if has_next else b"last")
+    return f'"jobs.{digest.hexdigest()[:32]}"'
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+@router.get(
+    "/jobs",
+    response_model=List[JobSummaryResponse],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def get_all_jobs(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    date_closing: datetime | None = Query(None, alias="dateClosing"),
+    approach: dc_models.Approach | None = Query(None),
+    fields: str | None = Query(None),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    columns, json_fields = projection = _list_projection(fields)
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        if cursor is not None:
+            _decode_cursor(cursor)  # reject a bad cursor before the 200 status line is sent
+        return StreamingResponse(
+            _stream_summaries_ndjson(approach, date_closing, cursor, projection),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    statement = _filtered_summary_query(approach=approach, date_closing=date_closing, cursor=cursor, columns=columns)
+    # Fetch one extra row to learn whether a next page exists without a COUNT query.
+    result = await db.execute(statement.order_by(JobModel.closing_date, JobModel.id).limit(limit + 1))
+    rows = result.all()
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    etag = _page_etag(rows, has_next)
+    if if_none_match is not None and _etag_matches(if_none_match, etag, weak=True):
+        return _not_modified(etag)
+    headers = {"ETag": etag}
+    if has_next:
+        last = rows[-1]
+        next_url = request.url.include_query_params(
+            limit=limit, cursor=_encode_cursor(last.closing_date, last.id)
+        )
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return Response(content=_summaries_json(rows, json_fields), media_type="application/json", headers=headers)
+
+
+@router.get("/jobs/search", response_model=List[JobSummaryResponse])
+async def search_jobs(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Full-text search ordered by relevance, then ``id``; paginated like ``GET /jobs``."""
+    search = _search_query(db.get_bind().dialect.name, q)
+    if search is None:
+        return Response(content=b"[]", media_type="application/json")
+    statement, rank = search
+    if cursor is not None:
+        last_rank, last_id = _decode_score_cursor(cursor)
+        statement = statement.where(or_(rank < last_rank, and_(rank == last_rank, JobModel.id > last_id)))
+
+    result = await db.execute(statement.order_by(rank.desc(), JobModel.id).limit(limit + 1))
+    rows = result.all()
+
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_url = request.url.include_query_params(limit=limit, cursor=_encode_score_cursor(last.rank, last.id))
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return Response(content=_summaries_json(rows), media_type="application/json", headers=headers)
+
+
+@router.get("/jobs/nearby", response_model=List[JobNearbyResponse])
+async def get_nearby_jobs(
+    request: Request,
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(DEFAULT_RADIUS_KM, alias="radiusKm", gt=0, le=MAX_RADIUS_KM),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Jobs with a location within ``radiusKm`` of the point, nearest first (ties by ``id``)."""
+    after = _decode_score_cursor(cursor) if cursor is not None else None
+    ranked = await jobs_within(db, latitude, longitude, radius_km, limit=limit + 1, after=after)
+    page = ranked[:limit]
+
+    headers = {}
+    if len(ranked) > limit:
+        last_distance, last_id = page[-1]
+        next_url = request.url.include_query_params(limit=limit, cursor=_encode_score_cursor(last_distance, last_id))
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    distances = {job_id: distance for distance, job_id in page}
+    rows = (await db.execute(select(*SUMMARY_COLUMNS).where(JobModel.id.in_(distances)))).all()
+    rows.sort(key=lambda row: (distances[row.id], row.id))
+    documents = []
+    for row in rows:
+        document = _row_to_document(row, _SUMMARY_JSON_FIELDS)
+        document["distanceKm"] = round(distances[row.id], 3)
+        documents.append(document)
+    return Response(content=_encode_json(documents).encode(), media_type="application/json", headers=headers)
+
+
+@router.get("/jobs/facets", response_model=Dict[str, List[JobFacetValue]])
+async def get_job_facets(db: AsyncSession = Depends(get_async_db)):
+    """Open-job counts per organisation, grade, profession, approach and assignmentType."""
+    return await facet_counts(db)
+
+
+@router.get("/jobs:export", responses={200: {"content": {"application/gzip": {}}}})
+async def export_jobs():
+    """Every job as a gzip-compressed NDJSON file of full Job documents."""
+    return StreamingResponse(
+        stream_jobs_export(),
+        media_type="application/gzip",
+        headers={"Content-Disposition": 'attachment; filename="jobs.ndjson.gz"'},
+    )
+
+
+@router.get("/jobs/changes", response_model=List[JobChangeResponse])
+async def get_job_changes(
+    request: Request,
+    since: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Jobs created, changed or archived after change sequence ``since``, in the order the changes were made.
+
+    A job appears once, as of its latest change; archived jobs appear with
+    ``archived: true``. Consumers store the ``changeSeq`` of the last item
+    they processed and pass it back as ``since``; ``since=0`` replays the
+    whole catalogue, archive included. Changes of writes that overlap a
+    still-running write transaction are held back until it ends (see
+    ``app.changes``).
+    """
+    branches = []
+    for model, archived in ((JobModel, False), (JobArchiveModel, True)):
+        columns = (getattr(model, attribute) for _, attribute in _CHANGE_JSON_FIELDS if attribute != "archived")
+        branches.append(
+            select(*columns, literal(archived).label("archived")).where(
+                model.change_seq > since, visible_changes(db, model.change_seq)
+            )
+        )
+    changes = union_all(*branches).subquery()
+    result = await db.execute(select(changes).order_by(changes.c.change_seq).limit(limit + 1))
+    jobs = result.all()
+
+    headers = {}
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_url = request.url.include_query_params(limit=limit, since=jobs[-1].change_seq)
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    body = _encode_json([_row_to_document(job, _CHANGE_JSON_FIELDS) for job in jobs]).encode()
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/jobs", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
-def create_job(
+async def create_job(
     job_payload: JobCreatePayload,
-    response: Response,
-    db: Session = Depends(get_db),
-    queue_publisher: QueuePublisher = Depends(get_queue_publisher),
+    db: AsyncSession = Depends(get_async_db),
+    job_cache: JobResponseCache = Depends(get_job_cache),
 ):
-    existing = db.query(JobModel).filter(JobModel.external_id == job_payload.external_id).first()
-    if existing:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job with externalId already exists")
-
     normalized = _normalize_payload(job_payload)
-    new_job = JobModel(**normalized)
+    normalized["content_hash"] = _content_hash(normalized)
+    change_seq = await next_change_seq(db)
+    try:
+        result = await db.execute(insert(JobModel).values(**normalized, change_seq=change_seq).returning(JobModel))
+    except IntegrityError as exc:
+        await db.rollback()
+        if _violated_constraint(exc) in _EXTERNAL_ID_CONSTRAINTS:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job with externalId already exists")
+        raise
+    new_job = result.scalars().one()
+
+    await replace_job_locations(db, {new_job.id: new_job.location}, new=True)
+    await apply_facet_deltas(db, facet_deltas(new=[new_job]))
+    add_outbox_message(db, new_job, Operation.CREATE)
+    await db.commit()
+    # The externalId may still have an archived job cached; the new live one takes precedence.
+    job_cache.invalidate(new_job.external_id, new_job.id, new_job.version)
+
+    return _job_json_response(
+        new_job,
+        status_code=status.HTTP_201_CREATED,
+        headers={"Location": f"/jobs/{new_job.external_id}", "ETag": _job_etag(new_job.id, new_job.version)},
+    )
 
-    db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
 
-    response.headers["Location"] = f"/jobs/{new_job.external_id}"
-    queue_publisher.send_job_message(new_job, Operation.CREATE)
-    return _job_model_to_response(new_job)
+# create_all names the constraint; migration 0001 enforces uniqueness through the index instead.
+_EXTERNAL_ID_CONSTRAINTS = frozenset({"uq_jobs_external_id", "ix_jobs_external_id"})
+
+
+def _violated_constraint(exc: IntegrityError) -> str | None:
+    """Name of the constraint behind an IntegrityError, without parsing driver message text.
+
+    asyncpg reports it on the error chained to the DBAPI wrapper, psycopg on
+    ``diag``. sqlite3 only names the columns, so a unique violation on
+    ``jobs.external_id`` is mapped to its constraint.
+    """
+    for error in (exc.orig, getattr(exc.orig, "__cause__", None)):
+        name = getattr(error, "constraint_name", None) or getattr(getattr(error, "diag", None), "constraint_name", None)
+        if name:
+            return name
+    if getattr(exc.orig, "sqlite_errorname", None) == "SQLITE_CONSTRAINT_UNIQUE" and exc.orig.args[0].endswith(
+        ": jobs.external_id"
+    ):
+        return "uq_jobs_external_id"
+    return None
+
+
+def _insert_for(db: AsyncSession):
+    """Dialect-specific INSERT construct supporting ON CONFLICT (Postgres and SQLite)."""
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+
+# A batch upsert is retried when a job it replaced was created concurrently after its locking read.
+BATCH_WRITE_ATTEMPTS = 3
+
+
+async def _lock_existing_jobs(db: AsyncSession, external_ids: Iterable[str]) -> Dict[str, Any]:
+    """Lock the existing jobs among ``external_ids`` and read what an upsert needs to know about them.
+
+    That is the facet columns (an upsert must retract their old counts) and
+    what identifies an unchanged resend.
+    """
+    result = await db.execute(
+        select(
+            JobModel.external_id,
+            JobModel.id,
+            JobModel.version,
+            JobModel.content_hash,
+            *(getattr(JobModel, column) for column in FACET_SOURCE_COLUMNS),
+        )
+        .where(JobModel.external_id.in_(external_ids))
+        .with_for_update()
+    )
+    return {row.external_id: row for row in result}
+
+
+async def _write_batch_rows(
+    db: AsyncSession, rows: Dict[str, Dict[str, Any]], *, upsert: bool
+) -> Tuple[List, Dict[str, Any]]:
+    """Insert (or upsert) ``rows`` in one statement.
+
+    Returns the written ``(id, external_id, version)`` rows and the locked
+    previous state of the jobs that already existed.
+
+    The locking read cannot see a job another transaction creates before the
+    upsert reaches it. Such a job would be replaced without its old values
+    (facet counts, locations) being retracted, so the attempt is rolled back
+    and repeated; the job then exists and is locked like the others.
+    """
+    for _ in range(BATCH_WRITE_ATTEMPTS):
+        first_seq = await next_change_seq(db, len(rows))
+        for offset, row in enumerate(rows.values()):
+            row["change_seq_offset"] = offset
+        bulk_insert = _insert_for(db)(JobModel).values(change_seq=first_seq + bindparam("change_seq_offset"))
+        if upsert:
+            previous = await _lock_existing_jobs(db, rows)
+            replaced_columns = {
+                column.name: bulk_insert.excluded[column.name]
+                for column in JobModel.__table__.columns
+                if column.name not in ("id", "external_id", "version")
+            }
+            statement = bulk_insert.on_conflict_do_update(
+                index_elements=[JobModel.external_id],
+                set_={**replaced_columns, "version": JobModel.version + 1},
+                # Unchanged resends are left alone: no row rewrite, version bump or message.
+                where=JobModel.content_hash.is_distinct_from(bulk_insert.excluded.content_hash),
+            )
+        else:
+            previous = {}
+            # A concurrent writer may have created one of these since the existence check.
+            statement = bulk_insert.on_conflict_do_nothing(index_elements=[JobModel.external_id])
+        written = (
+            await db.execute(
+                statement.returning(JobModel.id, JobModel.external_id, JobModel.version),
+                list(rows.values()),
+            )
+        ).all()
+        if all(job.version == 1 or job.external_id in previous for job in written):
+            return written, previous
+        await db.rollback()
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Jobs in this batch are being created concurrently; retry the request",
+    )
+
+
+@router.post(
+    "/jobs:batch",
+    response_model=List[JobBatchItemResult],
+    response_model_exclude_none=True,
+)
+async def create_jobs_batch(
+    job_payloads: List[Dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    upsert: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+    job_cache: JobResponseCache = Depends(get_job_cache),
+):
+    """Create (or with ``upsert=true``, create-or-replace) many jobs in one transaction.
+
+    Each item is validated on its own and gets its own status: 201 created,
+    200 replaced, 400 invalid, 409 already exists (or repeated in the batch).
+    """
+    results: List[JobBatchItemResult] = []
+    rows: Dict[str, Dict[str, Any]] = {}
+    indexes: Dict[str, int] = {}
+    for index, item in enumerate(job_payloads):
+        try:
+            payload = JobCreatePayload.model_validate(item)
+        except ValidationError as exc:
+            external_id = item.get("externalId") if isinstance(item, dict) else None
+            results.append(
+                JobBatchItemResult(
+                    index=index,
+                    external_id=external_id if isinstance(external_id, str) else None,
+                    status=status.HTTP_400_BAD_REQUEST,
+                    detail=exc.errors(include_url=False, include_context=False),
+                )
+            )
+            continue
+        if payload.external_id in rows:
+            results.append(
+                JobBatchItemResult(
+                    index=index,
+                    external_id=payload.external_id,
+                    status=status.HTTP_409_CONFLICT,
+                    detail="externalId appears earlier in this batch",
+                )
+            )
+            continue
+        row = rows[payload.external_id] = _normalize_payload(payload)
+        row["content_hash"] = _content_hash(row)
+        indexes[payload.external_id] = index
+
+    if rows and not upsert:
+        result = await db.execute(select(JobModel.external_id).where(JobModel.external_id.in_(rows)))
+        for external_id in result.scalars().all():
+            results.append(
+                JobBatchItemResult(
+                    index=indexes[external_id],
+                    external_id=external_id,
+                    status=status.HTTP_409_CONFLICT,
+                    detail="Job with externalId already exists",
+                )
+            )
+            del rows[external_id]
+
+    if rows:
+        written, previous = await _write_batch_rows(db, rows, upsert=upsert)
+
+        await replace_job_locations(db, {job.id: rows[job.external_id]["location"] for job in written}, new=not upsert)
+        await apply_facet_deltas(
+            db,
+            facet_deltas(
+                old=[previous[job.external_id] for job in written if job.version > 1 and job.external_id in previous],
+                new=[rows[job.external_id] for job in written],
+            ),
+        )
+        add_outbox_messages(
+            db,
+            ((job, Operation.CREATE if job.version == 1 else Operation.REPLACE) for job in written),
+        )
+        await db.commit()
+        for job in written:
+            job_cache.invalidate(job.external_id, job.id, job.version)
+
+        for job in written:
+            results.append(
+                JobBatchItemResult(
+                    index=indexes[job.external_id],
+                    external_id=job.external_id,
+                    status=status.HTTP_201_CREATED if job.version == 1 else status.HTTP_200_OK,
+                    id=job.id,
+                    version=job.version,
+                )
+            )
+        for external_id in rows.keys() - {job.external_id for job in written}:
+            current = previous.get(external_id)
+            if upsert and current is not None and current.content_hash == rows[external_id]["content_hash"]:
+                results.append(
+                    JobBatchItemResult(
+                        index=indexes[external_id],
+                        external_id=external_id,
+                        status=status.HTTP_200_OK,
+                        id=current.id,
+                        version=current.version,
+                    )
+                )
+                continue
+            results.append(
+                JobBatchItemResult(
+                    index=indexes[external_id],
+                    external_id=external_id,
+                    status=status.HTTP_409_CONFLICT,
+                    detail="Job with externalId already exists",
+                )
+            )
+
+    return sorted(results, key=lambda result: result.index)
 
 
 @router.get("/jobs/{external_id}", response_model=JobResponse)
-def get_job_by_external_id(external_id: str, db: Session = Depends(get_db)):
-    job = db.query(JobModel).filter(JobModel.external_id == external_id).first()
+async def get_job_by_external_id(
+    external_id: str,
+    fields: str | None = Query(None),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    job_cache: JobResponseCache = Depends(get_job_cache),
+):
+    # Sparse reads bypass the cache, which holds full documents only; they select just their columns.
+    selected = _parse_fields(fields) if fields is not None else None
+    cached = job_cache.get(external_id) if selected is None else None
+    if cached is not None:
+        if if_none_match is not None and _etag_matches(if_none_match, cached.etag, weak=True):
+            return _not_modified(cached.etag)
+        return Response(content=cached.body, media_type="application/json", headers={"ETag": cached.etag})
+
+    if if_none_match is not None:
+        # Revalidation only needs (id, version); the full row is loaded only when it changed.
+        result = await db.execute(
+            select(JobModel.id, JobModel.version).where(JobModel.external_id == external_id)
+        )
+        current = result.first()
+        if current is None:
+            result = await db.execute(
+                select(JobArchiveModel.id, JobArchiveModel.version).where(JobArchiveModel.external_id == external_id)
+            )
+            current = result.first()
+        if current is None:
+            raise _not_found(external_id)
+        etag = _job_etag(current.id, current.version)
+        if _etag_matches(if_none_match, etag, weak=True):
+            return _not_modified(etag)
+
+    if selected is not None:
+        # The ETag stays "id.version": each fields= projection is its own URL, and so its own resource.
+        job = await _get_job_or_404(
+            db, external_id, ["version", *(attribute for _, attribute in selected)], include_archived=True
+        )
+        body = _encode_json(_row_to_document(job, selected)).encode()
+        return Response(content=body, media_type="application/json", headers={"ETag": _job_etag(job.id, job.version)})
+
+    job = await _get_job_or_404(db, external_id, include_archived=True)
+    etag = _job_etag(job.id, job.version)
+    body = _job_json(job)
+    job_cache.put(external_id, job.id, job.version, etag, body)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+async def _unchanged_job_response(
+    db: AsyncSession,
+    job_cache: JobResponseCache,
+    external_id: str,
+    current,
+    if_match: str | None,
+) -> Response | None:
+    """Answer a write that would change nothing with the job's current representation.
+
+    ``current`` is the job's ``(id, version)`` as read when the write was found
+    to be a no-op. Returns None when the job has changed since then, in which
+    case the caller performs the write after all.
+    """
+    etag = _job_etag(current.id, current.version)
+    if if_match is not None and not _etag_matches(if_match, etag, weak=False):
+        await _raise_write_precondition(db, external_id, if_match)
+    cached = job_cache.get(external_id)
+    if cached is not None and cached.etag == etag:
+        return Response(content=cached.body, media_type="application/json", headers={"ETag": etag})
+    result = await db.execute(select(JobModel).where(JobModel.id == current.id, JobModel.version == current.version))
+    job = result.scalars().first()
     if job is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job with externalId '{external_id}' not found")
-    return _job_model_to_response(job)
+        return None
+    body = _job_json(job)
+    job_cache.put(external_id, job.id, job.version, etag, body)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.put("/jobs/{external_id}", response_model=JobResponse)
-def replace_job(
+async def replace_job(
     external_id: str,
     job_payload: JobCreatePayload,
-    db: Session = Depends(get_db),
-    queue_publisher: QueuePublisher = Depends(get_queue_publisher),
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    job_cache: JobResponseCache = Depends(get_job_cache),
 ):
     if job_payload.external_id != external_id:
         raise HTTPException(
@@ -207,48 +1208,79 @@ def replace_job(
             detail="externalId in body must match path parameter",
         )
 
-    job = db.query(JobModel).filter(JobModel.external_id == external_id).first()
-    if job is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job with externalId '{external_id}' not found")
-
     normalized = _normalize_payload(job_payload)
-    for key, value in normalized.items():
-        if key == "id":
-            continue
-        setattr(job, key, value)
+    values = {key: value for key, value in normalized.items() if key not in ("id", "external_id")}
+    values["content_hash"] = _content_hash(values)
+    result = await db.execute(
+        select(JobModel.id, JobModel.version).where(
+            JobModel.external_id == external_id, JobModel.content_hash == values["content_hash"]
+        )
+    )
+    current = result.first()
+    if current is not None:
+        response = await _unchanged_job_response(db, job_cache, external_id, current, if_match)
+        if response is not None:
+            return response
+
+    values["change_seq"] = await next_change_seq(db)
+    job, old = await _update_returning(db, external_id, values, if_match, old_facets=True)
 
-    job.version += 1
-    db.commit()
-    db.refresh(job)
-    queue_publisher.send_job_message(job, Operation.REPLACE)
-    return _job_model_to_response(job)
+    await replace_job_locations(db, {job.id: job.location})
+    await apply_facet_deltas(db, facet_deltas(old=[old], new=[job]))
+    add_outbox_message(db, job, Operation.REPLACE)
+    await db.commit()
+    job_cache.invalidate(external_id, job.id, job.version)
+    return _job_json_response(job, headers={"ETag": _job_etag(job.id, job.version)})
 
 
 @router.patch("/jobs/{external_id}", response_model=JobResponse)
-def update_job(
+async def update_job(
     external_id: str,
     job_payload: JobUpdatePayload,
-    db: Session = Depends(get_db),
-    queue_publisher: QueuePublisher = Depends(get_queue_publisher),
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    job_cache: JobResponseCache = Depends(get_job_cache),
 ):
-    job = db.query(JobModel).filter(JobModel.external_id == external_id).first()
-    if job is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job with externalId '{external_id}' not found")
-
     updates = _normalize_payload(job_payload, exclude_unset=True)
     if "external_id" in updates:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="externalId cannot be modified via PATCH",
         )
-    if updates:
-        for key, value in updates.items():
-            if key == "id":
-                continue
-            setattr(job, key, value)
-        job.version += 1
-        db.commit()
-        db.refresh(job)
-        queue_publisher.send_job_message(job, Operation.UPDATE)
+    updates.pop("id", None)
+    if not updates:
+        job = await _get_job_or_404(db, external_id)
+        if if_match is not None and not _etag_matches(if_match, _job_etag(job.id, job.version), weak=False):
+            await _raise_write_precondition(db, external_id, if_match)
+        return _job_json_response(job, headers={"ETag": _job_etag(job.id, job.version)})
+
+    # Compare with the stored values of just the patched columns before taking any write lock.
+    columns = [getattr(JobModel, key) for key in updates]
+    current = (
+        await db.execute(select(JobModel.id, JobModel.version, *columns).where(JobModel.external_id == external_id))
+    ).first()
+    if current is not None and all(
+        _stored_equals(stored, updates[key]) for key, stored in zip(updates, current[2:])
+    ):
+        response = await _unchanged_job_response(db, job_cache, external_id, current, if_match)
+        if response is not None:
+            return response
 
-    return _job_model_to_response(job)
+    change_seq = await next_change_seq(db)
+    touches_facets = not updates.keys().isdisjoint(FACET_SOURCE_COLUMNS)
+    # The merged content is no longer what any full write hashed.
+    job, old = await _update_returning(
+        db,
+        external_id,
+        {**updates, "change_seq": change_seq, "content_hash": None},
+        if_match,
+        old_facets=touches_facets,
+    )
+    if "location" in updates:
+        await replace_job_locations(db, {job.id: job.location})
+    if touches_facets:
+        await apply_facet_deltas(db, facet_deltas(old=[old], new=[job]))
+    add_outbox_message(db, job, Operation.UPDATE)
+    await db.commit()
+    job_cache.invalidate(external_id, job.id, job.version)
+    return _job_json_response(job, headers={"ETag": _job_etag(job.id, job.version)})
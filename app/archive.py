@@ -0,0 +1,114 @@
+"""Archival of closed jobs out of the hot ``jobs`` table.
+
+Traffic goes almost entirely to open vacancies, so jobs that closed more than
+``ARCHIVE_AFTER_DAYS`` ago (default ``30``) are moved to ``jobs_archive`` in
+batches of ``ARCHIVE_BATCH_SIZE`` (default ``1000``). Each batch commits on
+its own, which keeps lock times short. List, search, nearby and facet
+queries then only touch live rows. ``GET /jobs/{externalId}`` falls back to
+the archive, so archived jobs stay readable, and ``GET /jobs/changes``
+reports each move as an ``archived`` entry. Archived jobs are read-only:
+writes to them return 404. Past-day facet counters, which no query reads
+any more, are pruned by the same sweep.
+
+Run it on a schedule (e.g. a daily cron job or Kubernetes CronJob) with::
+
+    python -m app.archive sweep
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.changes import CHANGE_SEQ_STRIDE, next_change_seq
+from app.database import AsyncSessionLocal
+from app.models import (
+    JobArchiveModel,
+    JobFacetCountModel,
+    JobLocationModel,
+    JobModel,
+)
+
+# Columns copied from jobs into jobs_archive (archived_at is added by the sweep).
+ARCHIVED_COLUMNS = tuple(column.name for column in JobModel.__table__.columns)
+
+
+def _get_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def archive_cutoff(now: datetime | None = None) -> datetime:
+    """Jobs closing before this instant are archived."""
+    now = now or datetime.now(timezone.utc)
+    return now - timedelta(days=_get_int("ARCHIVE_AFTER_DAYS", 30))
+
+
+async def _archive_batch(db: AsyncSession, cutoff: datetime, batch_size: int, now: datetime) -> int:
+    result = await db.execute(
+        select(JobModel.id)
+        .where(JobModel.closing_date < cutoff)
+        .order_by(JobModel.closing_date)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    ids = result.scalars().all()
+    if not ids:
+        await db.rollback()
+        return 0
+    first_seq = await next_change_seq(db, len(ids))
+
+    # A job re-created after being archived replaces its older archived copy.
+    await db.execute(
+        delete(JobArchiveModel).where(
+            JobArchiveModel.external_id.in_(select(JobModel.external_id).where(JobModel.id.in_(ids)))
+        )
+    )
+    # Archiving is a change: a fresh change_seq puts the job in GET /jobs/changes as a tombstone.
+    copied = {name: JobModel.__table__.c[name] for name in ARCHIVED_COLUMNS}
+    copied["change_seq"] = first_seq - 1 + func.row_number().over(order_by=JobModel.id)
+    await db.execute(
+        insert(JobArchiveModel).from_select(
+            [*copied, "archived_at"],
+            select(*copied.values(), literal(now, DateTime(timezone=True))).where(JobModel.id.in_(ids)),
+        )
+    )
+    # Postgres cascades this, SQLite does not enforce foreign keys.
+    await db.execute(delete(JobLocationModel).where(JobLocationModel.job_id.in_(ids)))
+    await db.execute(delete(JobModel).where(JobModel.id.in_(ids)))
+    await db.commit()
+    return len(ids)
+
+
+async def archive_closed_jobs(
+    db: AsyncSession, *, now: datetime | None = None, batch_size: int | None = None
+) -> int:
+    """Move every job that closed before ``archive_cutoff(now)`` to the archive. Returns how many moved."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = archive_cutoff(now)
+    batch_size = min(batch_size or _get_int("ARCHIVE_BATCH_SIZE", 1000), CHANGE_SEQ_STRIDE)
+    archived = 0
+    while moved := await _archive_batch(db, cutoff, batch_size, now):
+        archived += moved
+    await db.execute(delete(JobFacetCountModel).where(JobFacetCountModel.closing_day < now.date()))
+    await db.commit()
+    return archived
+
+
+async def _sweep() -> None:
+    async with AsyncSessionLocal() as db:
+        archived = await archive_closed_jobs(db)
+    print(f"Archived {archived} closed jobs.")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    if sys.argv[1:] != ["sweep"]:
+        sys.exit("usage: python -m app.archive sweep")
+    asyncio.run(_sweep())
@@ -0,0 +1,126 @@
+"""In-process read-through cache for serialised job detail responses.
+
+Entries are keyed by ``external_id`` and hold the already-encoded JSON body
+together with the job ``(id, version)`` it was built from. Write paths
+invalidate by version: the entry is replaced with a body-less marker carrying
+the written job's id and new version, so until the marker expires a slow
+reader that loaded an older row, or another job with the same ``external_id``
+(an archived one it replaced), cannot re-populate the cache with it. Each worker has its own cache; ``JOB_CACHE_TTL_SECONDS`` bounds
+how long another worker's write can go unseen.
+
+Configuration (environment):
+
+- ``JOB_CACHE_ENABLED`` (default ``true``)
+- ``JOB_CACHE_MAX_ENTRIES`` (default ``1024``)
+- ``JOB_CACHE_TTL_SECONDS`` (default ``30``)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CachedJob:
+    job_id: Any
+    version: int
+    etag: str | None
+    body: bytes | None
+    expires_at: float
+
+
+class JobResponseCache:
+    def __init__(self, *, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled and max_entries > 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedJob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, external_id: str) -> CachedJob | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(external_id)
+            if entry is None or entry.body is None or entry.expires_at <= time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(external_id)
+            self.hits += 1
+            return entry
+
+    def put(self, external_id: str, job_id: Any, version: int, etag: str, body: bytes) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            current = self._entries.get(external_id)
+            if current is not None and current.expires_at > now:
+                if current.job_id != job_id or current.version > version:
+                    return  # a newer write already happened; never cache an older body
+            self._store(external_id, CachedJob(job_id, version, etag, body, now + self.ttl_seconds))
+
+    def invalidate(self, external_id: str, job_id: Any, version: int) -> None:
+        """Drop the cached body and remember ``(job_id, version)`` as the oldest acceptable one."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._store(external_id, CachedJob(job_id, version, None, None, time.monotonic() + self.ttl_seconds))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _store(self, external_id: str, entry: CachedJob) -> None:
+        self._entries[external_id] = entry
+        self._entries.move_to_end(external_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _get_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _get_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+_job_cache: JobResponseCache | None = None
+
+
+def get_job_cache() -> JobResponseCache:
+    global _job_cache
+    if _job_cache is None:
+        _job_cache = JobResponseCache(
+            max_entries=_get_int("JOB_CACHE_MAX_ENTRIES", 1024),
+            ttl_seconds=_get_float("JOB_CACHE_TTL_SECONDS", 30.0),
+            enabled=os.getenv("JOB_CACHE_ENABLED", "true").lower() not in ("0", "false", "no"),
+        )
+    return _job_cache
@@ -0,0 +1,61 @@
+"""``jobs.change_seq`` values for the ``GET /jobs/changes`` feed.
+
+A consumer keeps the ``changeSeq`` of the last job it processed, so a change
+must never become visible below a position that has already been served.
+
+On Postgres the values come from the writing transaction's id, with no
+shared row to lock: a transaction stamps its rows with
+``xid * CHANGE_SEQ_STRIDE + 0, 1, 2, ...``, computed inside the write
+statement itself, so it costs no extra round trip. Transactions can commit
+in any order, so the feed only serves values below
+``pg_snapshot_xmin(pg_current_snapshot()) * CHANGE_SEQ_STRIDE``. Every
+transaction with a smaller id has finished by then, and anything committed
+later sorts above the horizon. A long-running write transaction holds the
+feed back until it ends.
+
+SQLite runs one write transaction at a time anyway, so there the single
+``jobs_change_counter`` row hands out consecutive values.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Text, cast, func, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models import JobsChangeCounterModel
+
+# Rows one transaction can stamp. Transaction ids stay far below 2**47, so values fit a BIGINT.
+CHANGE_SEQ_STRIDE = 1 << 16
+
+
+def _current_xact_id():
+    return cast(cast(func.pg_current_xact_id(), Text), BigInteger)
+
+
+async def next_change_seq(db: AsyncSession, count: int = 1) -> ColumnElement[int] | int:
+    """Reserve ``count`` consecutive change_seq values for the current transaction and return the first.
+
+    On Postgres the result is a SQL expression for the write statement to
+    evaluate; add the row's offset (``0`` to ``count - 1``) to it either way.
+    Call it at most once per transaction.
+    """
+    if count > CHANGE_SEQ_STRIDE:
+        raise ValueError(f"A transaction can stamp at most {CHANGE_SEQ_STRIDE} rows; got {count}")
+    if db.get_bind().dialect.name == "postgresql":
+        return _current_xact_id() * CHANGE_SEQ_STRIDE
+    # The counter's row lock is held until commit, so values become visible in increasing order.
+    result = await db.execute(
+        update(JobsChangeCounterModel)
+        .values(value=JobsChangeCounterModel.value + count)
+        .returning(JobsChangeCounterModel.value)
+    )
+    return result.scalar_one() - count + 1
+
+
+def visible_changes(db: AsyncSession, change_seq):
+    """WHERE clause limiting the feed to change_seq values no later commit can fall below."""
+    if db.get_bind().dialect.name != "postgresql":
+        return true()
+    horizon = cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+    return change_seq < horizon * CHANGE_SEQ_STRIDE
@@ -0,0 +1,161 @@
+"""Facet counts for open jobs, maintained incrementally by the write handlers.
+
+``job_facet_counts`` holds one counter per (facet, value, closing day). Every
+job write adds ``-1`` for the job's old facet values and ``+1`` for its new
+ones in the same transaction, so ``GET /jobs/facets`` reads
+O(facet values x open days) rows instead of scanning jobs. Bucketing by UTC
+closing day keeps "open" correct as time passes: whole future days come from
+the counters, and jobs closing later today are counted live through the
+``closing_date`` index.
+
+Repair drift (e.g. after manual SQL edits) with::
+
+    python -m app.facets rebuild
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models import JobFacetCountModel, JobModel
+
+# API facet name -> JobModel column name.
+FACETS = {
+    "organisation": "organisation",
+    "grade": "grade",
+    "profession": "profession",
+    "approach": "approach",
+    "assignmentType": "assignment_type",
+}
+
+# Columns a write must know the old values of to keep the counts right.
+FACET_SOURCE_COLUMNS = (*FACETS.values(), "closing_date")
+
+FacetKey = Tuple[str, str, date]
+
+
+def _closing_day(closing_date: datetime) -> date:
+    if closing_date.tzinfo is None:  # SQLite returns naive UTC
+        return closing_date.date()
+    return closing_date.astimezone(timezone.utc).date()
+
+
+def _value(job: Any, column: str) -> Any:
+    return job[column] if isinstance(job, Mapping) else getattr(job, column)
+
+
+def facet_keys(job: Any) -> List[FacetKey]:
+    """The (facet, value, closing day) counters ``job`` (a row, model or column dict) contributes to."""
+    day = _closing_day(_value(job, "closing_date"))
+    return [(facet, _value(job, column), day) for facet, column in FACETS.items()]
+
+
+def facet_deltas(old: Iterable[Any] = (), new: Iterable[Any] = ()) -> Counter:
+    """Counter changes for replacing the ``old`` job states with the ``new`` ones."""
+    deltas: Counter = Counter()
+    for job in old:
+        deltas.subtract(facet_keys(job))
+    for job in new:
+        deltas.update(facet_keys(job))
+    return deltas
+
+
+def old_facet_values_query(external_id: str):
+    """Lock the job row and read its id and the columns needed to retract its current counts."""
+    columns = [getattr(JobModel, column) for column in FACET_SOURCE_COLUMNS]
+    return select(JobModel.id, *columns).where(JobModel.external_id == external_id).with_for_update()
+
+
+async def apply_facet_deltas(db: AsyncSession, deltas: Counter) -> None:
+    """Add ``deltas`` to the counters in the caller's transaction (one multi-row upsert)."""
+    rows = [
+        {"facet": facet, "value": value, "closing_day": day, "count": delta}
+        for (facet, value, day), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(JobFacetCountModel)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[JobFacetCountModel.facet, JobFacetCountModel.value, JobFacetCountModel.closing_day],
+            set_={"count": JobFacetCountModel.count + statement.excluded.count},
+        ),
+        rows,
+    )
+
+
+async def facet_counts(db: AsyncSession, now: datetime | None = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Open-job counts per facet value, largest first."""
+    now = now or datetime.now(timezone.utc)
+    today = now.astimezone(timezone.utc).date()
+    tomorrow = datetime.combine(today + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+    totals: Counter = Counter()
+    result = await db.execute(
+        select(JobFacetCountModel.facet, JobFacetCountModel.value, func.sum(JobFacetCountModel.count))
+        .where(JobFacetCountModel.closing_day > today)
+        .group_by(JobFacetCountModel.facet, JobFacetCountModel.value)
+    )
+    for facet, value, count in result:
+        totals[(facet, value)] += count
+
+    # Today's bucket is partly closed already; count what is still open from jobs itself.
+    closing_today = await db.execute(
+        select(*(getattr(JobModel, column) for column in FACETS.values())).where(
+            JobModel.closing_date >= now, JobModel.closing_date < tomorrow
+        )
+    )
+    for row in closing_today:
+        totals.update(zip(FACETS, row))
+
+    facets: Dict[str, List[Dict[str, Any]]] = {facet: [] for facet in FACETS}
+    for (facet, value), count in sorted(totals.items(), key=lambda item: (-item[1], item[0])):
+        if count > 0 and facet in facets:
+            facets[facet].append({"value": value, "count": count})
+    return facets
+
+
+async def rebuild_facet_counts(db: AsyncSession) -> int:
+    """Recompute every counter from the jobs table and commit. Returns the number of counters written.
+
+    Counters for days already past are dropped rather than rebuilt.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Waits for in-flight writers that touched the counters; blocks new ones until commit.
+        await db.execute(text("LOCK TABLE job_facet_counts IN EXCLUSIVE MODE"))
+    await db.execute(delete(JobFacetCountModel))
+
+    start_of_today = datetime.combine(datetime.now(timezone.utc).date(), time.min, tzinfo=timezone.utc)
+    columns = [getattr(JobModel, column) for column in FACET_SOURCE_COLUMNS]
+    result = await db.stream(
+        select(*columns).where(JobModel.closing_date >= start_of_today).execution_options(yield_per=1000)
+    )
+    deltas: Counter = Counter()
+    async for row in result:
+        deltas.update(facet_keys(row._mapping))
+    await apply_facet_deltas(db, deltas)
+    await db.commit()
+    return len(deltas)
+
+
+async def _rebuild() -> None:
+    async with AsyncSessionLocal() as db:
+        written = await rebuild_facet_counts(db)
+    print(f"Rebuilt {written} facet counters.")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python -m app.facets rebuild")
+    asyncio.run(_rebuild())
@@ -0,0 +1,136 @@
+"""Location points for radius search over jobs.
+
+Every latitude/longitude pair in a job's ``location`` JSON is copied into the
+``job_locations`` side table by the write handlers, in the same transaction
+as the job itself. ``GET /jobs/nearby`` then range-scans the
+``(latitude, longitude)`` index with a bounding box around the search point
+and ranks only those candidates by exact haversine distance, so no job JSON
+is parsed at query time. Distances, ordering and the page cursor are all
+evaluated in SQL, so only one page of jobs leaves the database.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import Float, and_, delete, func, insert, or_, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import JobLocationModel
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LATITUDE = EARTH_RADIUS_KM * math.pi / 180
+
+
+def extract_points(location: Any) -> List[Tuple[float, float]]:
+    """Return the (latitude, longitude) pairs of a job's ``location`` value.
+
+    Entries without coordinates (e.g. overseas locations) are skipped.
+    """
+    entries = location if isinstance(location, list) else [location]
+    points = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        latitude, longitude = entry.get("latitude"), entry.get("longitude")
+        if isinstance(latitude, (int, float)) and isinstance(longitude, (int, float)):
+            points.append((float(latitude), float(longitude)))
+    return points
+
+
+async def replace_job_locations(db: AsyncSession, locations: Dict[str, Any], *, new: bool = False) -> None:
+    """Rewrite the location points of the given jobs (``{job_id: location}``) in the caller's transaction.
+
+    Pass ``new=True`` for freshly inserted jobs to skip the delete.
+    """
+    if not locations:
+        return
+    if not new:
+        await db.execute(delete(JobLocationModel).where(JobLocationModel.job_id.in_(locations)))
+    rows = [
+        {"job_id": job_id, "latitude": latitude, "longitude": longitude}
+        for job_id, location in locations.items()
+        for latitude, longitude in extract_points(location)
+    ]
+    if rows:
+        await db.execute(insert(JobLocationModel), rows)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box_clause(latitude: float, longitude: float, radius_km: float):
+    """WHERE clause selecting every point that can be within ``radius_km``.
+
+    A superset of the circle: exact distances are checked afterwards. Handles
+    boxes that reach a pole or cross the antimeridian.
+    """
+    d_lat = radius_km / KM_PER_DEGREE_LATITUDE
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    sin_angle = math.sin(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    if max_lat >= 90 or min_lat <= -90 or sin_angle >= cos_lat:
+        return JobLocationModel.latitude.between(max(min_lat, -90.0), min(max_lat, 90.0))
+
+    # Widest longitude offset of the circle (it is not reached at the centre latitude).
+    d_lon = math.degrees(math.asin(sin_angle / cos_lat))
+    in_latitude = JobLocationModel.latitude.between(min_lat, max_lat)
+    min_lon, max_lon = longitude - d_lon, longitude + d_lon
+    if min_lon < -180:
+        in_longitude = or_(JobLocationModel.longitude >= min_lon + 360, JobLocationModel.longitude <= max_lon)
+    elif max_lon > 180:
+        in_longitude = or_(JobLocationModel.longitude >= min_lon, JobLocationModel.longitude <= max_lon - 360)
+    else:
+        in_longitude = JobLocationModel.longitude.between(min_lon, max_lon)
+    return and_(in_latitude, in_longitude)
+
+
+def haversine_km_expression(latitude: float, longitude: float):
+    """SQL for ``haversine_km`` from the point to each ``job_locations`` row."""
+    phi1 = math.radians(latitude)
+    phi2 = func.radians(JobLocationModel.latitude)
+    sin_half_d_phi = func.sin((phi2 - phi1) / 2.0)
+    sin_half_d_lambda = func.sin((func.radians(JobLocationModel.longitude) - math.radians(longitude)) / 2.0)
+    a = sin_half_d_phi * sin_half_d_phi + math.cos(phi1) * func.cos(phi2) * sin_half_d_lambda * sin_half_d_lambda
+    # Radii are capped far below half the circumference, so ``a`` never rounds past 1 and asin needs no clamp.
+    return type_coerce(2 * EARTH_RADIUS_KM * func.asin(func.sqrt(a)), Float)
+
+
+async def jobs_within(
+    db: AsyncSession,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    *,
+    limit: int,
+    after: Tuple[float, str] | None = None,
+) -> List[Tuple[float, str]]:
+    """Up to ``limit`` ``(distance_km, job_id)`` pairs for jobs with a point within ``radius_km``, nearest first.
+
+    Ties are broken by id, and ``after`` (a previous page's last pair) resumes
+    past that position. A job with several locations is ranked by its nearest
+    one. The database computes the distances of the bounding-box candidates
+    and returns only the requested page (a top-N sort), so paging does not
+    re-read every candidate into Python.
+    """
+    nearest = (
+        select(JobLocationModel.job_id, func.min(haversine_km_expression(latitude, longitude)).label("distance"))
+        .where(bounding_box_clause(latitude, longitude, radius_km))
+        .group_by(JobLocationModel.job_id)
+        .subquery()
+    )
+    statement = select(nearest.c.distance, nearest.c.job_id).where(nearest.c.distance <= radius_km)
+    if after is not None:
+        last_distance, last_id = after
+        statement = statement.where(
+            or_(nearest.c.distance > last_distance, and_(nearest.c.distance == last_distance, nearest.c.job_id > last_id))
+        )
+    result = await db.execute(statement.order_by(nearest.c.distance, nearest.c.job_id).limit(limit))
+    return [(distance, job_id) for distance, job_id in result]
+
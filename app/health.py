@@ -0,0 +1,155 @@
+"""Background health monitor backing the liveness and readiness probes.
+
+Probes must never touch the database themselves: with many orchestrator
+probes per worker, a slow database would otherwise stall the event loop and
+eat pool connections. ``HealthMonitor`` checks the database (and optionally
+SQS) on an interval from a background task and keeps the result. The probe
+endpoints just read that snapshot plus the pool counters, so each one costs
+microseconds.
+
+Configuration (environment):
+
+- ``HEALTH_CHECK_INTERVAL`` seconds between checks (default ``5``)
+- ``HEALTH_CHECK_TIMEOUT`` seconds before a check counts as failed (default ``2``)
+- ``HEALTH_CHECK_SQS`` also check the queue (default ``false``)
+- ``READINESS_MAX_POOL_SATURATION`` not ready at or above this fraction of
+  pool capacity checked out (default ``1.0``)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Dict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import async_engine
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+UNAVAILABLE = "unavailable"
+UNKNOWN = "unknown"
+DISABLED = "disabled"
+
+
+def _get_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _sqs_check_enabled() -> bool:
+    return os.getenv("HEALTH_CHECK_SQS", "false").lower() in ("1", "true", "yes")
+
+
+class HealthMonitor:
+    def __init__(
+        self,
+        *,
+        engine: AsyncEngine = async_engine,
+        publisher=None,
+        interval: float | None = None,
+        timeout: float | None = None,
+        max_pool_saturation: float | None = None,
+    ):
+        self.engine = engine
+        # Only publishers that expose ``check()`` (SQS) are probed.
+        self.publisher = publisher
+        self.interval = interval if interval is not None else _get_float("HEALTH_CHECK_INTERVAL", 5.0)
+        self.timeout = timeout if timeout is not None else _get_float("HEALTH_CHECK_TIMEOUT", 2.0)
+        self.max_pool_saturation = (
+            max_pool_saturation
+            if max_pool_saturation is not None
+            else _get_float("READINESS_MAX_POOL_SATURATION", 1.0)
+        )
+        self.db_status = UNKNOWN
+        self.queue_status = UNKNOWN if publisher is not None and hasattr(publisher, "check") else DISABLED
+        self.checked_at: float | None = None
+
+    async def _check_db(self) -> str:
+        async with self.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        return OK
+
+    async def _check_queue(self) -> str:
+        # boto3 is blocking; keep it off the event loop.
+        await asyncio.to_thread(self.publisher.check)
+        return OK
+
+    async def _timed(self, name: str, check) -> str:
+        try:
+            return await asyncio.wait_for(check(), timeout=self.timeout)
+        except Exception:
+            logger.warning("%s health check failed", name, exc_info=True)
+            return UNAVAILABLE
+
+    async def refresh(self) -> None:
+        """Run all checks once and store the results."""
+        self.db_status = await self._timed("Database", self._check_db)
+        if self.queue_status != DISABLED:
+            self.queue_status = await self._timed("Queue", self._check_queue)
+        self.checked_at = time.monotonic()
+
+    async def run(self) -> None:
+        """Refresh forever; intended to run as a background task."""
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Health check iteration failed")
+            await asyncio.sleep(self.interval)
+
+    def pool_stats(self) -> Dict[str, float]:
+        pool = self.engine.pool
+        size = pool.size() if hasattr(pool, "size") else 0
+        checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+        capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+        return {
+            "size": size,
+            "checkedOut": checked_out,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else 0,
+            "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+        }
+
+    def readiness(self) -> Dict:
+        """Snapshot of the cached check results; never does I/O."""
+        pool = self.pool_stats()
+        age = None if self.checked_at is None else round(time.monotonic() - self.checked_at, 3)
+        # Results older than a few intervals mean the monitor itself is stuck.
+        stale = age is None or age > 3 * self.interval + self.timeout
+        ready = (
+            not stale
+            and self.db_status == OK
+            and self.queue_status in (OK, DISABLED)
+            and pool["saturation"] < self.max_pool_saturation
+        )
+        return {
+            "status": OK if ready else UNAVAILABLE,
+            "db": self.db_status,
+            "queue": self.queue_status,
+            "pool": pool,
+            "checkedSecondsAgo": age,
+        }
+
+
+_health_monitor: HealthMonitor | None = None
+
+
+def get_health_monitor() -> HealthMonitor:
+    global _health_monitor
+    if _health_monitor is None:
+        publisher = None
+        if _sqs_check_enabled():
+            from app.queue import get_queue_publisher
+
+            publisher = get_queue_publisher()
+        _health_monitor = HealthMonitor(publisher=publisher)
+    return _health_monitor
@@ -1,24 +1,43 @@
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
-from sqlalchemy import text
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from app.api.v1.jobs import router as jobs_router
-from app.database import engine
-from app.models import Base
+from app.cache import get_job_cache
+from app.health import get_health_monitor
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.outbox import OutboxRelay, outbox_relay_enabled
+from app.queue import get_queue_publisher
+from app.startup import prepare_database
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle application lifespan events."""
-    # Startup: Create database tables
-    Base.metadata.create_all(bind=engine)
+    # Startup: create_all, Alembic head check or nothing, per SCHEMA_STARTUP_MODE
+    await prepare_database()
+    # Readiness stays 503 until the monitor's first check completes
+    monitor_task = asyncio.create_task(get_health_monitor().run())
+    relay = relay_task = None
+    if outbox_relay_enabled():
+        relay = OutboxRelay(get_queue_publisher())
+        relay_task = asyncio.create_task(relay.run())
     yield
-    # Shutdown: Clean up resources if needed
+    monitor_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await monitor_task
+    # Shutdown: stop polling, then relay anything committed since the last poll
+    if relay_task is not None:
+        relay_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await relay_task
+        await relay.drain()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(_, exc: RequestValidationError):
@@ -30,22 +49,31 @@ app.include_router(jobs_router)
 
 @app.get("/health")
 async def health() -> dict:
-    """Simple health endpoint. Returns 200 and minimal payload.
+    """Liveness probe. Returns 200 while the process can serve requests.
 
-    Attempts a lightweight DB query; still returns ok on failure to avoid
-    cascading outages during DB restarts.
+    Never touches the database: ``db`` is the status from the background
+    health monitor, so a slow database cannot stall probes (or the event loop).
     """
-    status = {"status": "ok"}
-    try:
-        # Lazy import to avoid circulars and keep startup fast
-        from app.database import SessionLocal
-
-        with SessionLocal() as db:
-            db.execute(text("SELECT 1"))
-            status["db"] = "ok"
-    except Exception:
-        status["db"] = "unavailable"
-    return status
+    return {"status": "ok", "db": get_health_monitor().db_status}
+
+
+@app.get("/health/ready")
+async def ready() -> JSONResponse:
+    """Readiness probe: 503 when the last DB/queue check failed, is stale, or the pool is saturated."""
+    readiness = get_health_monitor().readiness()
+    return JSONResponse(status_code=200 if readiness["status"] == "ok" else 503, content=readiness)
+
+
+@app.get("/cache/stats")
+async def cache_stats() -> dict:
+    """Hit/miss counters and sizing for the in-process job detail cache."""
+    return {"jobDetail": get_job_cache().stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint: route latency, DB, pool and queue metrics."""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
 
 
 @app.get("/")
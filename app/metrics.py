@@ -0,0 +1,275 @@
+"""In-process Prometheus metrics for the Jobs API.
+
+A deliberately small registry (counters and fixed-bucket histograms) that is
+cheap enough to leave on at full traffic: an observation is a ``bisect`` and a
+few integer increments under an uncontended lock, and pool gauges are only
+read when ``/metrics`` is scraped. Exposed in the Prometheus text format by
+``GET /metrics``. Counters are per worker process; Prometheus aggregates
+across workers by instance.
+
+Exported series:
+
+- ``jobs_api_request_duration_seconds{method,route}`` and
+  ``jobs_api_requests_total{method,route,status}``
+- ``jobs_api_db_query_duration_seconds{engine}`` for every statement, plus
+  ``jobs_api_db_queries_per_request{method,route}`` and
+  ``jobs_api_db_time_per_request_seconds{method,route}``
+- ``jobs_api_db_pool_*{engine}`` gauges and ``jobs_api_db_pool_wait_seconds``
+- ``jobs_api_queue_publish_duration_seconds{operation}`` and
+  ``jobs_api_queue_publish_failures_total{operation}``
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def sum(self, *labels: str) -> float:
+        series = self._series.get(labels)
+        return series[1] if series else 0.0
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series[0]), series[1], series[2]) for labels, series in self._series.items()]
+        for labels, bucket_counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    "jobs_api_request_duration_seconds", "HTTP request latency by route.", ("method", "route")
+)
+REQUESTS = Counter("jobs_api_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+DB_QUERY_DURATION = Histogram(
+    "jobs_api_db_query_duration_seconds", "Duration of individual SQL statements.", ("engine",)
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "jobs_api_db_queries_per_request", "SQL statements executed per HTTP request.", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "jobs_api_db_time_per_request_seconds", "Time spent in SQL statements per HTTP request.", ("method", "route")
+)
+DB_POOL_WAIT = Histogram(
+    "jobs_api_db_pool_wait_seconds", "Time spent waiting for a pooled connection.", ("engine",)
+)
+QUEUE_PUBLISH_DURATION = Histogram(
+    "jobs_api_queue_publish_duration_seconds", "Latency of queue publish calls.", ("operation",)
+)
+QUEUE_PUBLISH_FAILURES = Counter(
+    "jobs_api_queue_publish_failures_total", "Queue publish calls that failed or were partially rejected.",
+    ("operation",),
+)
+
+_REGISTRY = (
+    REQUEST_DURATION,
+    REQUESTS,
+    DB_QUERY_DURATION,
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    DB_POOL_WAIT,
+    QUEUE_PUBLISH_DURATION,
+    QUEUE_PUBLISH_FAILURES,
+)
+
+
+# Per-request [statement count, seconds in SQL]; SQLAlchemy runs async-engine
+# statements in a greenlet that shares the request task's context.
+_request_db_stats: contextvars.ContextVar[list | None] = contextvars.ContextVar("request_db_stats", default=None)
+
+# Engines whose pools are reported at scrape time, keyed by metrics label.
+_instrumented_engines: Dict[str, Engine] = {}
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """Time every statement run on ``engine`` (pass ``async_engine.sync_engine`` for async)."""
+
+    # The start time lives on the execution context, so a failed statement
+    # (no after_cursor_execute) leaves nothing behind.
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        DB_QUERY_DURATION.observe(elapsed, label)
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats[0] += 1
+            stats[1] += elapsed
+
+    _instrumented_engines[label] = engine
+
+
+class _TimedCheckoutMixin:
+    metrics_label = "default"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started, self.metrics_label)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def _pool_lines() -> List[str]:
+    gauges = {
+        "jobs_api_db_pool_size": ("Configured pool size.", "size"),
+        "jobs_api_db_pool_checked_out": ("Connections currently checked out.", "checkedout"),
+        "jobs_api_db_pool_checked_in": ("Idle connections held by the pool.", "checkedin"),
+        "jobs_api_db_pool_overflow": ("Connections open beyond pool_size (negative when below it).", "overflow"),
+    }
+    lines: List[str] = []
+    for name, (documentation, method) in gauges.items():
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+        for label, engine in _instrumented_engines.items():
+            reader = getattr(engine.pool, method, None)
+            if reader is not None:
+                lines.append(f'{name}{{engine="{label}"}} {reader()}')
+    return lines
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _REGISTRY:
+        lines += metric.collect()
+    lines += _pool_lines()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: per-route latency, status and per-request DB stats."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        stats = [0, 0.0]
+        token = _request_db_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_db_stats.reset(token)
+            route = scope.get("route")
+            # Label by route template, never the raw path, to keep cardinality bounded.
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            REQUEST_DURATION.observe(elapsed, method, path)
+            REQUESTS.inc(method, path, status)
+            DB_QUERIES_PER_REQUEST.observe(stats[0], method, path)
+            DB_TIME_PER_REQUEST.observe(stats[1], method, path)
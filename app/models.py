@@ -1,32 +1,57 @@
 """SQLAlchemy models for the Jobs API."""
 
+import os
+import time
 import uuid
+from datetime import datetime, timezone
 from sqlalchemy import (
+    BigInteger,
     Column,
+    Date,
+    Float,
+    ForeignKey,
     String,
     Integer,
     DateTime,
     Text,
+    Index,
     UniqueConstraint,
+    Uuid,
 )
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import JSON
+from sqlalchemy import DDL, JSON, event
 
 from app.database import Base
 
 # Prefer JSONB on Postgres, but fall back to generic JSON for SQLite tests.
 JSONType = JSONB().with_variant(JSON, "sqlite")
 
+# Native 16-byte uuid on Postgres (CHAR(32) hex elsewhere); Python sees the usual hyphenated string.
+UuidString = Uuid(as_uuid=False)
 
-class JobModel(Base):
-    """SQLAlchemy model for Job table."""
 
-    __tablename__ = "jobs"
-    __table_args__ = (UniqueConstraint("external_id", name="uq_jobs_external_id"),)
+def uuid7() -> str:
+    """New time-ordered UUID (RFC 9562 version 7) in the usual hyphenated form.
+
+    The leading 48-bit millisecond timestamp makes new jobs land at the
+    right-hand edge of the primary key index instead of on random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 9562 variant
+    return str(uuid.UUID(int=value))
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+
+class JobColumns:
+    """Columns shared by ``jobs`` and ``jobs_archive``; each table declares its own ``external_id``."""
+
+    id = Column(UuidString, primary_key=True, default=uuid7)
     version = Column(Integer, nullable=False, default=1)
-    external_id = Column(String, nullable=False, index=True)
+    # Position of the job's latest write in GET /jobs/changes; assigned by app.changes.
+    change_seq = Column(BigInteger, nullable=False)
+    # SHA-256 of the content columns as last written by a full write (create, PUT, batch); NULL
+    # after a PATCH. Lets PUT detect a resend of unchanged content without loading the row.
+    content_hash = Column(String(64), nullable=True)
     approach = Column(String, nullable=False)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
@@ -61,3 +86,137 @@ class JobModel(Base):
     working_for_the_civil_service = Column(Text, nullable=True)
     eligibility_check = Column(Text, nullable=True)
     attachments = Column(JSONType, nullable=True)
+
+
+class JobModel(JobColumns, Base):
+    """SQLAlchemy model for Job table."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        UniqueConstraint("external_id", name="uq_jobs_external_id"),
+        # Supports keyset pagination of GET /jobs ordered on (closing_date, id).
+        Index("ix_jobs_closing_date_id", "closing_date", "id"),
+        # Turns "open jobs for approach X" into an index range scan in the same keyset order.
+        Index("ix_jobs_approach_closing_date", "approach", "closing_date", "id"),
+        # Serves GET /jobs/changes: "changed since N" is a range scan in feed order.
+        Index("ix_jobs_change_seq", "change_seq", unique=True),
+    )
+
+    external_id = Column(String, nullable=False, index=True)
+
+
+class JobArchiveModel(JobColumns, Base):
+    """Job whose closing date passed, moved out of ``jobs`` by ``app.archive``.
+
+    Read-only. Only the ``GET /jobs/{externalId}`` fallback and ``GET /jobs:export`` read it.
+    """
+
+    __tablename__ = "jobs_archive"
+    __table_args__ = (
+        UniqueConstraint("external_id", name="uq_jobs_archive_external_id"),
+        # Archiving stamps a new change_seq; GET /jobs/changes reads the tombstones in order.
+        Index("ix_jobs_archive_change_seq", "change_seq", unique=True),
+    )
+
+    external_id = Column(String, nullable=False)
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class JobLocationModel(Base):
+    """One latitude/longitude point of a job's ``location``, kept in sync by the write handlers.
+
+    Backs ``GET /jobs/nearby``; see ``app.geo``.
+    """
+
+    __tablename__ = "job_locations"
+    __table_args__ = (
+        # Bounding-box prefilter: range scan on latitude, filter on longitude from the index.
+        Index("ix_job_locations_latitude_longitude", "latitude", "longitude"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    job_id = Column(UuidString, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+
+
+class JobFacetCountModel(Base):
+    """Number of jobs with a facet value that close on a given UTC day; see ``app.facets``."""
+
+    __tablename__ = "job_facet_counts"
+
+    facet = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    closing_day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class OutboxMessageModel(Base):
+    """Queue message recorded in the same transaction as the job write.
+
+    Rows are relayed to the queue by ``app.outbox.OutboxRelay`` and deleted
+    once published.
+    """
+
+    __tablename__ = "queue_outbox"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    message = Column(JSONType, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+
+class JobsChangeCounterModel(Base):
+    """Single-row counter that hands out ``jobs.change_seq`` values on SQLite.
+
+    Postgres derives them from transaction ids instead; see ``app.changes``.
+    """
+
+    __tablename__ = "jobs_change_counter"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+
+event.listen(
+    JobsChangeCounterModel.__table__,
+    "after_create",
+    DDL("INSERT INTO jobs_change_counter (id, value) VALUES (1, 0)"),
+)
+
+
+# Full-text search index behind GET /jobs/search. Not mapped on JobModel, so
+# ORM loads never fetch it; the migrations create the same objects.
+# Postgres: a stored generated tsvector (title > summary/organisation > description) with a GIN index.
+JOBS_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(organisation, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+for _statement in (
+    f"ALTER TABLE jobs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({JOBS_SEARCH_VECTOR_SQL}) STORED",
+    "CREATE INDEX ix_jobs_search_vector ON jobs USING gin (search_vector)",
+):
+    event.listen(JobModel.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+# SQLite: an external-content FTS5 table keyed on jobs.rowid, kept in sync by triggers.
+JOBS_FTS_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE jobs_fts USING fts5("
+    "title, summary, description, organisation, content='jobs', content_rowid='rowid')",
+    "CREATE TRIGGER jobs_fts_ai AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO jobs_fts (rowid, title, summary, description, organisation) "
+    "VALUES (new.rowid, new.title, new.summary, new.description, new.organisation); END",
+    "CREATE TRIGGER jobs_fts_ad AFTER DELETE ON jobs BEGIN "
+    "INSERT INTO jobs_fts (jobs_fts, rowid, title, summary, description, organisation) "
+    "VALUES ('delete', old.rowid, old.title, old.summary, old.description, old.organisation); END",
+    "CREATE TRIGGER jobs_fts_au AFTER UPDATE OF title, summary, description, organisation ON jobs BEGIN "
+    "INSERT INTO jobs_fts (jobs_fts, rowid, title, summary, description, organisation) "
+    "VALUES ('delete', old.rowid, old.title, old.summary, old.description, old.organisation); "
+    "INSERT INTO jobs_fts (rowid, title, summary, description, organisation) "
+    "VALUES (new.rowid, new.title, new.summary, new.description, new.organisation); END",
+)
+
+for _statement in JOBS_FTS_SQLITE_DDL:
+    event.listen(JobModel.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(JobModel.__table__, "before_drop", DDL("DROP TABLE IF EXISTS jobs_fts").execute_if(dialect="sqlite"))
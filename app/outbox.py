@@ -0,0 +1,156 @@
+"""Transactional outbox for queue messages and the relay that drains it.
+
+Write handlers stage their queue message as a ``queue_outbox`` row inside the
+same transaction as the job change, so request latency never includes the
+SQS call and a committed write can never lose its message. ``OutboxRelay``
+publishes pending rows in batches (``SendMessageBatch`` on SQS) and deletes
+them only after the publisher accepted them (at-least-once delivery). Within
+a batch, repeated Update/Replace messages for the same job are collapsed into
+the latest one, so a burst of patches costs one message downstream.
+
+Run the relay in-process (started from the FastAPI lifespan unless
+``OUTBOX_RELAY_ENABLED=false``) or as a separate process::
+
+    python -m app.outbox
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import AsyncSessionLocal
+from app.models import JobModel, OutboxMessageModel
+from app.queue import Operation, QueuePublisher, build_queue_message, get_queue_publisher
+
+logger = logging.getLogger(__name__)
+
+
+def _get_batch_size() -> int:
+    try:
+        return max(1, int(os.getenv("OUTBOX_BATCH_SIZE", "100")))
+    except ValueError:
+        return 100
+
+
+def _get_poll_interval() -> float:
+    try:
+        return float(os.getenv("OUTBOX_POLL_INTERVAL", "1.0"))
+    except ValueError:
+        return 1.0
+
+
+def outbox_relay_enabled() -> bool:
+    return os.getenv("OUTBOX_RELAY_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def add_outbox_message(db: AsyncSession, job: JobModel, operation: Operation) -> None:
+    """Stage the queue message for ``job`` in the caller's transaction."""
+    db.add(OutboxMessageModel(message=build_queue_message(job, operation)))
+
+
+def add_outbox_messages(db: AsyncSession, changes: Iterable[Tuple[JobModel, Operation]]) -> None:
+    """Stage messages for a set of changed jobs; flushed as one multi-row INSERT."""
+    db.add_all(OutboxMessageModel(message=build_queue_message(job, operation)) for job, operation in changes)
+
+
+_COALESCED_OPERATIONS = {Operation.UPDATE.value, Operation.REPLACE.value}
+
+
+def coalesce_messages(pending: List[Tuple[int, dict]]) -> List[Tuple[List[int], dict]]:
+    """Collapse repeated Update/Replace messages for the same job into the latest one.
+
+    Returns ``(outbox_ids, message)`` entries; every id folded into an entry is
+    settled when that entry is sent. Create messages are never collapsed.
+    """
+    entries: List[Tuple[List[int], dict]] = []
+    change_index: Dict[str, int] = {}
+    for outbox_id, message in pending:
+        if message.get("operation") in _COALESCED_OPERATIONS:
+            index = change_index.get(message["externalId"])
+            if index is not None:
+                entries[index] = (entries[index][0] + [outbox_id], message)
+                continue
+            change_index[message["externalId"]] = len(entries)
+        entries.append(([outbox_id], message))
+    return entries
+
+
+def _publish_pending(publisher: QueuePublisher, pending: List[Tuple[int, dict]]) -> List[int]:
+    """Publish one coalesced batch; returns the outbox ids that were settled."""
+    entries = coalesce_messages(pending)
+    try:
+        sent = publisher.send_message_batch([message for _, message in entries])
+    except Exception:
+        logger.exception("Failed to relay %s outbox messages; will retry", len(entries))
+        return []
+    if len(sent) < len(entries):
+        logger.warning("Queue accepted %s of %s outbox messages; will retry the rest", len(sent), len(entries))
+    return [outbox_id for index in sent for outbox_id in entries[index][0]]
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        publisher: QueuePublisher,
+        *,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        batch_size: int | None = None,
+        poll_interval: float | None = None,
+    ):
+        self.publisher = publisher
+        self.session_factory = session_factory
+        self.batch_size = batch_size or _get_batch_size()
+        self.poll_interval = poll_interval if poll_interval is not None else _get_poll_interval()
+
+    async def drain_once(self) -> Tuple[int, int]:
+        """Relay one batch. Returns ``(fetched, published)`` row counts."""
+        async with self.session_factory() as db:
+            # SKIP LOCKED lets several relays (one per worker) share the outbox
+            # without sending the same row twice; SQLite ignores the clause.
+            result = await db.execute(
+                select(OutboxMessageModel.id, OutboxMessageModel.message)
+                .order_by(OutboxMessageModel.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            pending = [(row.id, row.message) for row in result]
+            if not pending:
+                return 0, 0
+
+            # Publishers are blocking (boto3), so keep them off the event loop.
+            published = await asyncio.to_thread(_publish_pending, self.publisher, pending)
+            if published:
+                await db.execute(delete(OutboxMessageModel).where(OutboxMessageModel.id.in_(published)))
+            await db.commit()
+            return len(pending), len(published)
+
+    async def drain(self) -> int:
+        """Relay until the outbox is empty or a publish fails. Returns outbox rows settled."""
+        total = 0
+        while True:
+            fetched, published = await self.drain_once()
+            total += published
+            if fetched < self.batch_size or published < fetched:
+                return total
+
+    async def run(self) -> None:
+        """Poll the outbox forever; intended to run as a background task."""
+        while True:
+            try:
+                await self.drain()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Outbox relay iteration failed")
+            await asyncio.sleep(self.poll_interval)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(OutboxRelay(get_queue_publisher()).run())
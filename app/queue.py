@@ -2,17 +2,21 @@ from __future__ import annotations
 
 import json
 import os
+import time
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Protocol, TYPE_CHECKING
+from typing import List, Protocol, Sequence, TYPE_CHECKING
 
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
+from app.metrics import QUEUE_PUBLISH_DURATION, QUEUE_PUBLISH_FAILURES
 
 if TYPE_CHECKING:  # pragma: no cover
     from app.models import JobModel
 
 
+# SendMessageBatch accepts at most 10 entries per call.
+SQS_MAX_BATCH_SIZE = 10
+
+
 class Operation(str, Enum):
     CREATE = "Create"
     UPDATE = "Update"
@@ -22,6 +26,12 @@ class Operation(str, Enum):
 class QueuePublisher(Protocol):
     def send_job_message(self, job: "JobModel", operation: Operation) -> None: ...
 
+    def send_message(self, message: dict) -> None: ...
+
+    def send_message_batch(self, messages: Sequence[dict]) -> List[int]:
+        """Send ``messages``; returns the indexes of the ones the queue accepted."""
+        ...
+
 
 def _get_message_version() -> int:
     try:
@@ -52,6 +62,12 @@ class NoOpQueuePublisher:
     def send_job_message(self, job: "JobModel", operation: Operation) -> None:
         return None
 
+    def send_message(self, message: dict) -> None:
+        return None
+
+    def send_message_batch(self, messages: Sequence[dict]) -> List[int]:
+        return list(range(len(messages)))
+
 
 class SqsQueuePublisher:
     def __init__(
@@ -64,9 +80,14 @@ class SqsQueuePublisher:
     ):
         if not queue_url and not queue_name:
             raise ValueError("SQS_QUEUE_URL or SQS_QUEUE_NAME must be provided")
+        # Imported here so workers that never publish to SQS don't pay boto3's import cost at startup.
+        import boto3
+        from botocore.exceptions import BotoCoreError, ClientError
+
         self.queue_url = queue_url
         self.queue_name = queue_name
         self.client = boto3.client("sqs", endpoint_url=endpoint_url, region_name=region_name or "us-east-1")
+        self._client_errors = (BotoCoreError, ClientError)
 
     def _ensure_queue_url(self) -> str:
         if self.queue_url:
@@ -76,12 +97,44 @@ class SqsQueuePublisher:
         return self.queue_url
 
     def send_job_message(self, job: "JobModel", operation: Operation) -> None:
+        self.send_message(build_queue_message(job, operation))
+
+    def check(self) -> None:
+        """Cheap reachability check used by the readiness probe; raises on failure."""
+        self.client.get_queue_attributes(QueueUrl=self._ensure_queue_url(), AttributeNames=["QueueArn"])
+
+    def send_message(self, message: dict) -> None:
         queue_url = self._ensure_queue_url()
-        message = build_queue_message(job, operation)
+        started = time.perf_counter()
         try:
             self.client.send_message(QueueUrl=queue_url, MessageBody=json.dumps(message))
-        except (BotoCoreError, ClientError) as exc:
+        except self._client_errors as exc:
+            QUEUE_PUBLISH_FAILURES.inc("send_message")
             raise RuntimeError(f"Failed to publish queue message: {exc}") from exc
+        finally:
+            QUEUE_PUBLISH_DURATION.observe(time.perf_counter() - started, "send_message")
+
+    def send_message_batch(self, messages: Sequence[dict]) -> List[int]:
+        queue_url = self._ensure_queue_url()
+        sent: List[int] = []
+        for start in range(0, len(messages), SQS_MAX_BATCH_SIZE):
+            entries = [
+                {"Id": str(index), "MessageBody": json.dumps(messages[index])}
+                for index in range(start, min(start + SQS_MAX_BATCH_SIZE, len(messages)))
+            ]
+            started = time.perf_counter()
+            try:
+                response = self.client.send_message_batch(QueueUrl=queue_url, Entries=entries)
+            except self._client_errors:
+                QUEUE_PUBLISH_FAILURES.inc("send_message_batch")
+                # Report what was accepted so far; the caller retries the rest.
+                break
+            finally:
+                QUEUE_PUBLISH_DURATION.observe(time.perf_counter() - started, "send_message_batch")
+            if response.get("Failed"):
+                QUEUE_PUBLISH_FAILURES.inc("send_message_batch")
+            sent.extend(int(entry["Id"]) for entry in response.get("Successful", []))
+        return sorted(sent)
 
 
 _publisher: QueuePublisher | None = None
@@ -0,0 +1,110 @@
+"""Worker startup: schema handling and connection pool pre-warming.
+
+Alembic owns the schema. Running ``create_all`` on every worker boot costs
+catalogue queries and risks DDL races between workers starting together, so
+production workers should only verify the schema revision, or trust the
+deployment, and get to serving traffic.
+
+Configuration (environment):
+
+- ``SCHEMA_STARTUP_MODE``: ``create`` (default) runs ``create_all``, for local
+  development and tests; ``check`` verifies once that the database is at the
+  Alembic head and refuses to start otherwise; ``skip`` touches nothing
+- ``SCHEMA_REVISION`` revision ``check`` expects; when unset the head is read
+  from ``migrations/``
+- ``DB_POOL_PREWARM`` connections to open before serving (default ``0``,
+  capped at the pool size)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import pathlib
+import time
+from typing import Set
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import async_engine, engine
+from app.models import Base
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = pathlib.Path(__file__).resolve().parent.parent / "migrations"
+SCHEMA_MODES = ("create", "check", "skip")
+
+
+def schema_startup_mode() -> str:
+    mode = os.getenv("SCHEMA_STARTUP_MODE", "create").lower()
+    if mode not in SCHEMA_MODES:
+        raise RuntimeError(f"SCHEMA_STARTUP_MODE must be one of {', '.join(SCHEMA_MODES)}; got {mode!r}")
+    return mode
+
+
+def _pool_prewarm_size() -> int:
+    try:
+        return max(0, int(os.getenv("DB_POOL_PREWARM", "0")))
+    except ValueError:
+        return 0
+
+
+def expected_schema_heads() -> Set[str]:
+    revision = os.getenv("SCHEMA_REVISION")
+    if revision:
+        return {revision}
+    # Only needed in check mode without SCHEMA_REVISION, so alembic stays out of the import path.
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory(str(MIGRATIONS_DIR)).get_heads())
+
+
+async def check_schema_revision(engine: AsyncEngine = async_engine) -> None:
+    """Raise unless the database's ``alembic_version`` matches the expected head(s)."""
+    try:
+        async with engine.connect() as connection:
+            result = await connection.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars())
+    except DBAPIError as exc:
+        raise RuntimeError("Database has no alembic_version table; run `alembic upgrade head`") from exc
+    expected = expected_schema_heads()
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+            f"expected {', '.join(sorted(expected))}; run `alembic upgrade head`"
+        )
+
+
+async def prewarm_pool(size: int, engine: AsyncEngine = async_engine) -> int:
+    """Open up to ``size`` pooled connections concurrently so the first requests don't pay for connecting."""
+    pool = engine.pool
+    if hasattr(pool, "size"):
+        size = min(size, pool.size())
+    if size <= 0:
+        return 0
+    connections = [engine.connect() for _ in range(size)]
+    try:
+        await asyncio.gather(*(connection.start() for connection in connections))
+    finally:
+        await asyncio.gather(*(connection.close() for connection in connections))
+    return size
+
+
+async def prepare_database() -> None:
+    """Run the configured schema step and pool pre-warm; called once per worker from the lifespan."""
+    started = time.perf_counter()
+    mode = schema_startup_mode()
+    if mode == "create":
+        Base.metadata.create_all(bind=engine)
+    elif mode == "check":
+        await check_schema_revision()
+    warmed = await prewarm_pool(_pool_prewarm_size())
+    logger.info(
+        "Database ready in %.3fs (schema %s, %d pooled connections pre-warmed)",
+        time.perf_counter() - started,
+        mode,
+        warmed,
+    )
@@ -0,0 +1,313 @@
+"""Reproducible throughput/latency benchmark for the Jobs API endpoints.
+
+Drives the ASGI app in-process (no network) with httpx, against a throwaway
+SQLite database by default or a local Postgres via ``--database-url``. For
+each table size the database is recreated and seeded with synthetic jobs,
+their locations and facet counts, then every scenario (list, detail, search,
+create, put, put_unchanged, patch) is run at each concurrency level.
+``put_unchanged`` first writes its jobs with an untimed PUT, since ``patch``
+clears the stored content hash, then times resending the same payloads, so it
+measures the no-op replace path. Queue messages go to the outbox and are drained with a
+stub publisher between scenarios, so SQS is never involved.
+
+Usage:
+    # Record a baseline on the machine you compare on
+    python benchmarks/api_benchmark.py --sizes 1000,10000 --concurrency 1,16 --output benchmarks/baseline.json
+    # Later runs with the same options fail on regressions against it
+    python benchmarks/api_benchmark.py --sizes 1000,10000 --concurrency 1,16 --baseline benchmarks/baseline.json
+
+WARNING: all Jobs API tables in the target database are dropped and recreated.
+
+Results are written as JSON. With ``--baseline`` every (size, concurrency,
+scenario) row is compared against the stored file. The exit status is 1
+when p95 latency rises, or throughput falls, by more than ``--tolerance``.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SCENARIOS = ("list", "detail", "search", "create", "put", "put_unchanged", "patch")
+ROLES = ("Data Scientist", "Policy Advisor", "Software Engineer", "Project Manager", "Economist", "Statistician")
+SEARCH_TERMS = ("data", "policy", "engineer", "manager", "economist", "statistician scientist")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="sync SQLAlchemy URL; defaults to a temporary SQLite file")
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated table sizes to seed")
+    parser.add_argument("--concurrency", default="1,16", help="comma-separated in-flight request counts")
+    parser.add_argument("--requests", type=int, default=300, help="requests per scenario and concurrency level")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for reproducible request mixes")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="JSON results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--no-cache", action="store_true", help="disable the job detail cache")
+    return parser.parse_args()
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Must run before any ``app`` import: engines are built from env at import time."""
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        path = os.path.join(tempfile.mkdtemp(prefix="jobs-bench-"), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["OUTBOX_RELAY_ENABLED"] = "false"
+    if args.no_cache:
+        os.environ["JOB_CACHE_ENABLED"] = "false"
+
+
+class StubQueuePublisher:
+    def send_job_message(self, job, operation) -> None:
+        return None
+
+    def send_message(self, message: dict) -> None:
+        return None
+
+    def send_message_batch(self, messages) -> List[int]:
+        return list(range(len(messages)))
+
+
+def synthetic_payload(external_id: str, rng: random.Random) -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "externalId": external_id,
+        "approach": rng.choice(["Internal", "Across Government", "External"]),
+        "title": f"{rng.choice(ROLES)} {external_id}",
+        "description": "Synthetic description. " * 40,
+        "organisation": rng.choice(["Cabinet Office", "HM Treasury", "Ministry of Defence"]),
+        "location": [
+            {
+                "townName": "London",
+                "region": "London",
+                "latitude": 51.5 + rng.uniform(-1, 1),
+                "longitude": -0.1 + rng.uniform(-1, 1),
+            }
+        ],
+        "grade": "Grade 7",
+        "assignmentType": "Permanent",
+        "workLocation": ["Office based"],
+        "workingPattern": ["Full-time"],
+        "personalSpec": "Synthetic personal specification. " * 20,
+        "applyDetail": "Apply online",
+        "dateClosing": (now + timedelta(days=rng.randint(1, 90), seconds=rng.randint(0, 86400))).isoformat(),
+        "datePosted": now.isoformat(),
+        "profession": "Policy",
+        "recruitmentEmail": "jobs@example.com",
+        "salary": {"minimum": 40000, "maximum": 50000, "currency": "GBP"},
+    }
+
+
+def reset_and_seed(size: int, rng: random.Random) -> Dict[str, dict]:
+    """Recreate the tables and seed ``size`` jobs the way POST /jobs writes them.
+
+    Returns the payload stored for each seeded external id.
+    """
+    from app.api.v1.jobs import JobCreatePayload, _content_hash, _normalize_payload
+    from app.cache import get_job_cache
+    from app.database import Base, engine
+    from app.facets import facet_deltas
+    from app.geo import extract_points
+    from app.models import JobFacetCountModel, JobLocationModel, JobModel, JobsChangeCounterModel, uuid7
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    get_job_cache().clear()
+
+    external_ids = [f"seed-{n:07d}" for n in range(size)]
+    payloads: Dict[str, dict] = {}
+    facet_counts: Counter = Counter()
+    with engine.begin() as connection:
+        for start in range(0, size, 1000):
+            rows, locations = [], []
+            for change_seq, external_id in enumerate(external_ids[start:start + 1000], start=start + 1):
+                payloads[external_id] = synthetic_payload(external_id, rng)
+                row = _normalize_payload(JobCreatePayload.model_validate(payloads[external_id]))
+                row["content_hash"] = _content_hash(row)
+                row["id"] = uuid7()
+                row["change_seq"] = change_seq
+                rows.append(row)
+                locations.extend(
+                    {"job_id": row["id"], "latitude": latitude, "longitude": longitude}
+                    for latitude, longitude in extract_points(row["location"])
+                )
+            facet_counts.update(facet_deltas(new=rows))
+            connection.execute(JobModel.__table__.insert(), rows)
+            if locations:
+                connection.execute(JobLocationModel.__table__.insert(), locations)
+        connection.execute(
+            JobFacetCountModel.__table__.insert(),
+            [
+                {"facet": facet, "value": value, "closing_day": day, "count": count}
+                for (facet, value, day), count in facet_counts.items()
+            ],
+        )
+        connection.execute(JobsChangeCounterModel.__table__.update().values(value=size))
+    return payloads
+
+
+def build_request(scenario: str, external_ids: List[str], payloads: Dict[str, dict], rng: random.Random):
+    """Return (method, url, json_body) for one request of ``scenario``.
+
+    ``payloads`` holds the payload each seeded job was created with.
+    """
+    if scenario == "list":
+        return "GET", "/jobs?limit=100", None
+    if scenario == "detail":
+        return "GET", f"/jobs/{rng.choice(external_ids)}", None
+    if scenario == "search":
+        return "GET", f"/jobs/search?q={rng.choice(SEARCH_TERMS)}&limit=20", None
+    if scenario == "create":
+        return "POST", "/jobs", synthetic_payload(f"bench-{uuid.uuid4().hex}", rng)
+    external_id = rng.choice(external_ids)
+    if scenario == "put":
+        return "PUT", f"/jobs/{external_id}", synthetic_payload(external_id, rng)
+    if scenario == "put_unchanged":
+        return "PUT", f"/jobs/{external_id}", payloads[external_id]
+    return "PATCH", f"/jobs/{external_id}", {"summary": f"Patched {uuid.uuid4().hex}"}
+
+
+async def run_scenario(client, scenario: str, payloads: Dict[str, dict], total: int, concurrency: int, rng) -> Dict:
+    external_ids = list(payloads)
+    requests = [build_request(scenario, external_ids, payloads, rng) for _ in range(total)]
+    if scenario == "put_unchanged":
+        # Earlier put/patch runs changed these jobs; write the payloads once so the timed requests are no-ops.
+        for url, body in {url: body for _, url, body in requests}.items():
+            await client.put(url, json=body)
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            method, url, body = queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    cut_points = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "scenario": scenario,
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 2),
+        "p50_ms": round(cut_points[49] * 1000, 3),
+        "p95_ms": round(cut_points[94] * 1000, 3),
+        "p99_ms": round(cut_points[98] * 1000, 3),
+    }
+
+
+async def run_benchmarks(args: argparse.Namespace) -> List[Dict]:
+    import httpx
+
+    from app.main import app
+    from app.outbox import OutboxRelay
+
+    rng = random.Random(args.seed)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    levels = [int(level) for level in args.concurrency.split(",")]
+    scenarios = [scenario for scenario in args.scenarios.split(",") if scenario]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    relay = OutboxRelay(StubQueuePublisher(), batch_size=1000)
+    results: List[Dict] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size in sizes:
+            payloads = await asyncio.to_thread(reset_and_seed, size, rng)
+            for concurrency in levels:
+                for scenario in scenarios:
+                    row = await run_scenario(client, scenario, payloads, args.requests, concurrency, rng)
+                    row.update({"size": size, "concurrency": concurrency})
+                    results.append(row)
+                    print(
+                        f"size={size:<8} c={concurrency:<4} {scenario:<13} "
+                        f"{row['throughput_rps']:>9.1f} req/s  p50={row['p50_ms']:>8.2f}ms  "
+                        f"p95={row['p95_ms']:>8.2f}ms  p99={row['p99_ms']:>8.2f}ms  errors={row['errors']}"
+                    )
+                    await relay.drain()
+    return results
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    def key(row: Dict):
+        return row["size"], row["concurrency"], row["scenario"]
+
+    previous = {key(row): row for row in baseline.get("results", [])}
+    regressions = []
+    for row in results:
+        before = previous.get(key(row))
+        if before is None:
+            continue
+        label = "size={} c={} {}".format(*key(row))
+        if row["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {before['p95_ms']}ms -> {row['p95_ms']}ms")
+        if row["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {before['throughput_rps']} -> {row['throughput_rps']} req/s")
+    return regressions
+
+
+def main() -> int:
+    args = parse_args()
+    configure_environment(args)
+
+    from app.database import engine
+
+    results = asyncio.run(run_benchmarks(args))
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "seed": args.seed,
+            "cache": not args.no_cache,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
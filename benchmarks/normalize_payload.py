@@ -0,0 +1,102 @@
+"""Micro-benchmark: precompiled payload normaliser vs. the recursive _to_plain walk.
+
+Usage:
+    python benchmarks/normalize_payload.py [--number 2000]
+
+The legacy implementation is kept here verbatim as the baseline; both are
+checked to produce the same column dict before timing.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+
+from app.api.v1.jobs import FIELD_MAP, JobCreatePayload, _normalize_payload  # noqa: E402
+
+
+def _legacy_to_plain(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, list):
+        return [_legacy_to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {k: _legacy_to_plain(v) for k, v in value.items()}
+    if isinstance(value, datetime):
+        return value
+    return str(value) if not isinstance(value, (str, int, float, bool)) else value
+
+
+def _legacy_normalize_payload(payload, *, exclude_unset: bool = False) -> Dict[str, Any]:
+    raw = payload.model_dump(by_alias=True, exclude_unset=exclude_unset)
+    normalized: Dict[str, Any] = {}
+    for key, value in raw.items():
+        column = FIELD_MAP.get(key, key)
+        normalized[column] = _legacy_to_plain(value)
+    return normalized
+
+
+def build_large_payload(locations: int = 20, contacts: int = 10, attachments: int = 10) -> JobCreatePayload:
+    now = datetime.now(timezone.utc)
+    return JobCreatePayload.model_validate(
+        {
+            "externalId": "bench-1",
+            "approach": "External",
+            "title": "Policy Advisor",
+            "description": "Description " * 200,
+            "organisation": "Cabinet Office",
+            "location": [
+                {"townName": f"Town {n}", "region": "London", "latitude": 51.5 + n / 100, "longitude": -0.1}
+                for n in range(locations)
+            ],
+            "grade": "Grade 7",
+            "assignmentType": "Permanent",
+            "workLocation": ["Office based"],
+            "workingPattern": ["Full-time"],
+            "personalSpec": "Spec " * 200,
+            "applyDetail": "Apply",
+            "dateClosing": (now + timedelta(days=30)).isoformat(),
+            "datePosted": now.isoformat(),
+            "profession": "Policy",
+            "recruitmentEmail": "jobs@example.com",
+            "contacts": [
+                {"contactName": f"Contact {n}", "contactEmail": f"c{n}@example.com"} for n in range(contacts)
+            ],
+            "applyUrl": "https://example.com/apply",
+            "salary": {"minimum": 40000, "maximum": 50000, "currency": "GBP"},
+            "attachments": [
+                {"href": f"https://example.com/{n}.pdf", "docName": f"Doc {n}", "docFormat": "pdf"}
+                for n in range(attachments)
+            ],
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="normalisations per timing run")
+    args = parser.parse_args()
+
+    payload = build_large_payload()
+    assert _normalize_payload(payload) == _legacy_normalize_payload(payload), "normalisers disagree"
+
+    legacy = min(timeit.repeat(lambda: _legacy_normalize_payload(payload), number=args.number, repeat=5))
+    current = min(timeit.repeat(lambda: _normalize_payload(payload), number=args.number, repeat=5))
+    print(f"legacy _to_plain walk : {legacy / args.number * 1e6:8.1f} us/payload")
+    print(f"precompiled normaliser: {current / args.number * 1e6:8.1f} us/payload")
+    print(f"speedup               : {legacy / current:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,17 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    """Keep autogenerate away from search objects that live outside the ORM metadata."""
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name == "ix_jobs_search_vector":
+        return False
+    if type_ == "table" and name.startswith("jobs_fts"):
+        return False
+    return True
+
+
 def get_url():
     return os.getenv("DATABASE_URL", config.get_main_option("sqlalchemy.url"))
 
@@ -26,6 +37,7 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -39,7 +51,7 @@ def run_migrations_online():
     connectable = create_engine(configuration["sqlalchemy.url"], poolclass=pool.NullPool)
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,17 @@
+"""Add (closing_date, id) index for keyset pagination of GET /jobs."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003_add_jobs_closing_date_id_index"
+down_revision = "0002_add_job_version_column"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_jobs_closing_date_id", "jobs", ["closing_date", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_closing_date_id", table_name="jobs")
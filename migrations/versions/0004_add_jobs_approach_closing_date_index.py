@@ -0,0 +1,17 @@
+"""Add (approach, closing_date, id) index for filtered GET /jobs queries."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_add_jobs_approach_closing_date_index"
+down_revision = "0003_add_jobs_closing_date_id_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_jobs_approach_closing_date", "jobs", ["approach", "closing_date", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_approach_closing_date", table_name="jobs")
@@ -0,0 +1,24 @@
+"""Create the jobs_change_counter table, which hands out jobs.change_seq values on SQLite (see app.changes)."""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_create_jobs_change_counter_table"
+down_revision = "0005_create_queue_outbox_table"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs_change_counter",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO jobs_change_counter (id, value) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    op.drop_table("jobs_change_counter")
@@ -0,0 +1,62 @@
+"""Add full-text search over jobs: tsvector + GIN on Postgres, FTS5 on SQLite."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0007_add_jobs_full_text_search"
+down_revision = "0006_create_jobs_change_counter_table"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(organisation, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+SQLITE_FTS_COLUMNS = "title, summary, description, organisation"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # Adding a stored generated column rewrites the table once; run during a quiet window on large tables.
+        op.execute(
+            f"ALTER TABLE jobs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+        )
+        op.execute("CREATE INDEX ix_jobs_search_vector ON jobs USING gin (search_vector)")
+        return
+
+    op.execute(
+        f"CREATE VIRTUAL TABLE jobs_fts USING fts5({SQLITE_FTS_COLUMNS}, content='jobs', content_rowid='rowid')"
+    )
+    op.execute(
+        "CREATE TRIGGER jobs_fts_ai AFTER INSERT ON jobs BEGIN "
+        f"INSERT INTO jobs_fts (rowid, {SQLITE_FTS_COLUMNS}) "
+        "VALUES (new.rowid, new.title, new.summary, new.description, new.organisation); END"
+    )
+    op.execute(
+        "CREATE TRIGGER jobs_fts_ad AFTER DELETE ON jobs BEGIN "
+        f"INSERT INTO jobs_fts (jobs_fts, rowid, {SQLITE_FTS_COLUMNS}) "
+        "VALUES ('delete', old.rowid, old.title, old.summary, old.description, old.organisation); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER jobs_fts_au AFTER UPDATE OF {SQLITE_FTS_COLUMNS} ON jobs BEGIN "
+        f"INSERT INTO jobs_fts (jobs_fts, rowid, {SQLITE_FTS_COLUMNS}) "
+        "VALUES ('delete', old.rowid, old.title, old.summary, old.description, old.organisation); "
+        f"INSERT INTO jobs_fts (rowid, {SQLITE_FTS_COLUMNS}) "
+        "VALUES (new.rowid, new.title, new.summary, new.description, new.organisation); END"
+    )
+    op.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_jobs_search_vector")
+        op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector")
+        return
+
+    for trigger in ("jobs_fts_ai", "jobs_fts_ad", "jobs_fts_au"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS jobs_fts")
@@ -0,0 +1,56 @@
+"""Create job_locations side table for radius search and backfill it from jobs.location."""
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0008_create_job_locations_table"
+down_revision = "0007_add_jobs_full_text_search"
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _points(location):
+    if isinstance(location, str):
+        location = json.loads(location)
+    for entry in location if isinstance(location, list) else [location]:
+        if not isinstance(entry, dict):
+            continue
+        latitude, longitude = entry.get("latitude"), entry.get("longitude")
+        if isinstance(latitude, (int, float)) and isinstance(longitude, (int, float)):
+            yield float(latitude), float(longitude)
+
+
+def upgrade() -> None:
+    job_locations = op.create_table(
+        "job_locations",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), autoincrement=True, nullable=False),
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_job_locations_job_id", "job_locations", ["job_id"])
+    op.create_index("ix_job_locations_latitude_longitude", "job_locations", ["latitude", "longitude"])
+
+    connection = op.get_bind()
+    rows = []
+    for job_id, location in connection.execute(sa.text("SELECT id, location FROM jobs")):
+        rows.extend({"job_id": job_id, "latitude": lat, "longitude": lon} for lat, lon in _points(location))
+        if len(rows) >= BACKFILL_BATCH_SIZE:
+            op.bulk_insert(job_locations, rows)
+            rows = []
+    if rows:
+        op.bulk_insert(job_locations, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_locations_latitude_longitude", table_name="job_locations")
+    op.drop_index("ix_job_locations_job_id", table_name="job_locations")
+    op.drop_table("job_locations")
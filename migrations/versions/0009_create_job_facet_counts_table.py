@@ -0,0 +1,62 @@
+"""Create job_facet_counts table for GET /jobs/facets and backfill it from open jobs."""
+
+from collections import Counter
+from datetime import datetime, time, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009_create_job_facet_counts_table"
+down_revision = "0008_create_job_locations_table"
+branch_labels = None
+depends_on = None
+
+
+FACETS = {
+    "organisation": "organisation",
+    "grade": "grade",
+    "profession": "profession",
+    "approach": "approach",
+    "assignmentType": "assignment_type",
+}
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    job_facet_counts = op.create_table(
+        "job_facet_counts",
+        sa.Column("facet", sa.String(), nullable=False),
+        sa.Column("value", sa.String(), nullable=False),
+        sa.Column("closing_day", sa.Date(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("facet", "value", "closing_day"),
+    )
+
+    jobs = sa.table(
+        "jobs",
+        sa.column("closing_date", sa.DateTime(timezone=True)),
+        *(sa.column(column, sa.String()) for column in FACETS.values()),
+    )
+    start_of_today = datetime.combine(datetime.now(timezone.utc).date(), time.min, tzinfo=timezone.utc)
+    counts = Counter()
+    result = op.get_bind().execute(
+        sa.select(jobs.c.closing_date, *(jobs.c[column] for column in FACETS.values())).where(
+            jobs.c.closing_date >= start_of_today
+        )
+    )
+    for closing_date, *values in result:
+        if closing_date.tzinfo is not None:
+            closing_date = closing_date.astimezone(timezone.utc)
+        counts.update((facet, value, closing_date.date()) for facet, value in zip(FACETS, values))
+
+    rows = [
+        {"facet": facet, "value": value, "closing_day": day, "count": count}
+        for (facet, value, day), count in counts.items()
+    ]
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        op.bulk_insert(job_facet_counts, rows[start : start + BACKFILL_BATCH_SIZE])
+
+
+def downgrade() -> None:
+    op.drop_table("job_facet_counts")
@@ -0,0 +1,36 @@
+"""Add jobs.change_seq for the GET /jobs/changes feed and number existing jobs."""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0010_add_jobs_change_seq"
+down_revision = "0009_create_job_facet_counts_table"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NOT NULL via a temporary default: SQLite can add such a column without rebuilding
+    # jobs (a rebuild would drop the full-text search triggers).
+    op.add_column("jobs", sa.Column("change_seq", sa.BigInteger(), nullable=False, server_default="0"))
+
+    # Number existing jobs after the current counter value, oldest first, and move the counter past them.
+    op.execute(
+        "UPDATE jobs SET change_seq = numbered.seq FROM ("
+        "SELECT id, (SELECT value FROM jobs_change_counter WHERE id = 1) "
+        "+ row_number() OVER (ORDER BY date_posted, id) AS seq FROM jobs"
+        ") AS numbered WHERE jobs.id = numbered.id"
+    )
+    op.execute(
+        "UPDATE jobs_change_counter SET value = COALESCE((SELECT MAX(change_seq) FROM jobs), 0) "
+        "WHERE id = 1 AND value < COALESCE((SELECT MAX(change_seq) FROM jobs), 0)"
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        op.alter_column("jobs", "change_seq", server_default=None)
+    op.create_index("ix_jobs_change_seq", "jobs", ["change_seq"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_change_seq", table_name="jobs")
+    op.drop_column("jobs", "change_seq")
@@ -0,0 +1,20 @@
+"""Add jobs.content_hash for detecting unchanged PUT and batch upsert resends."""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0011_add_jobs_content_hash"
+down_revision = "0010_add_jobs_change_seq"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing jobs: the digest is defined by the API's payload normalisation,
+    # and the next full write of each job records it.
+    op.add_column("jobs", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "content_hash")
@@ -0,0 +1,50 @@
+"""Store jobs.id and job_locations.job_id as native UUIDs.
+
+Existing ids are converted in place, so every public id (responses, ETags,
+queue messages) keeps its value and string form. New ids are time-ordered
+UUIDv7 generated by the application.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0012_convert_job_ids_to_native_uuid"
+down_revision = "0011_add_jobs_content_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # Rewrites both tables and rebuilds their indexes with 16-byte keys.
+        op.drop_constraint("job_locations_job_id_fkey", "job_locations", type_="foreignkey")
+        op.execute("ALTER TABLE jobs ALTER COLUMN id TYPE uuid USING id::uuid")
+        op.execute("ALTER TABLE job_locations ALTER COLUMN job_id TYPE uuid USING job_id::uuid")
+        op.create_foreign_key(
+            "job_locations_job_id_fkey", "job_locations", "jobs", ["job_id"], ["id"], ondelete="CASCADE"
+        )
+    else:
+        # SQLAlchemy's Uuid type stores 32 hex digits on SQLite. The declared column type is left
+        # alone: changing it would rebuild jobs and drop the full-text search triggers.
+        op.execute("UPDATE jobs SET id = lower(replace(id, '-', ''))")
+        op.execute("UPDATE job_locations SET job_id = lower(replace(job_id, '-', ''))")
+
+
+def _hyphenated(column: str) -> str:
+    return (
+        f"substr({column}, 1, 8) || '-' || substr({column}, 9, 4) || '-' || substr({column}, 13, 4)"
+        f" || '-' || substr({column}, 17, 4) || '-' || substr({column}, 21)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_constraint("job_locations_job_id_fkey", "job_locations", type_="foreignkey")
+        op.execute("ALTER TABLE jobs ALTER COLUMN id TYPE varchar USING id::text")
+        op.execute("ALTER TABLE job_locations ALTER COLUMN job_id TYPE varchar USING job_id::text")
+        op.create_foreign_key(
+            "job_locations_job_id_fkey", "job_locations", "jobs", ["job_id"], ["id"], ondelete="CASCADE"
+        )
+    else:
+        op.execute(f"UPDATE jobs SET id = {_hyphenated('id')} WHERE length(id) = 32")
+        op.execute(f"UPDATE job_locations SET job_id = {_hyphenated('job_id')} WHERE length(job_id) = 32")
@@ -0,0 +1,48 @@
+"""Give archived jobs a change_seq of their own, so GET /jobs/changes reports them as tombstones."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0014_stamp_archived_job_changes"
+down_revision = "0013_create_jobs_archive_table"
+branch_labels = None
+depends_on = None
+
+
+# Must match app.changes.CHANGE_SEQ_STRIDE: rows one transaction can stamp.
+CHANGE_SEQ_STRIDE = 1 << 16
+
+
+def upgrade() -> None:
+    # Jobs archived so far kept the change_seq of their last write, below what consumers may have synced.
+    if op.get_bind().dialect.name == "postgresql":
+        # Values derive from the stamping transaction's id, so each batch commits on its own.
+        floor = op.get_bind().exec_driver_sql("SELECT pg_current_xact_id()::text::bigint").scalar_one()
+        with op.get_context().autocommit_block():
+            while True:
+                result = op.get_bind().exec_driver_sql(
+                    "UPDATE jobs_archive SET change_seq = numbered.seq FROM ("
+                    f"SELECT id, pg_current_xact_id()::text::bigint * {CHANGE_SEQ_STRIDE} "
+                    "+ row_number() OVER (ORDER BY archived_at, id) - 1 AS seq FROM jobs_archive "
+                    f"WHERE change_seq < {floor * CHANGE_SEQ_STRIDE} ORDER BY archived_at, id "
+                    f"LIMIT {CHANGE_SEQ_STRIDE}"
+                    ") AS numbered WHERE jobs_archive.id = numbered.id"
+                )
+                if result.rowcount == 0:
+                    break
+    else:
+        op.execute(
+            "UPDATE jobs_archive SET change_seq = numbered.seq FROM ("
+            "SELECT id, (SELECT value FROM jobs_change_counter WHERE id = 1) "
+            "+ row_number() OVER (ORDER BY archived_at, id) AS seq FROM jobs_archive"
+            ") AS numbered WHERE jobs_archive.id = numbered.id"
+        )
+        op.execute(
+            "UPDATE jobs_change_counter SET value = COALESCE((SELECT MAX(change_seq) FROM jobs_archive), 0) "
+            "WHERE id = 1 AND value < COALESCE((SELECT MAX(change_seq) FROM jobs_archive), 0)"
+        )
+    op.create_index("ix_jobs_archive_change_seq", "jobs_archive", ["change_seq"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_archive_change_seq", table_name="jobs_archive")
@@ -0,0 +1,30 @@
+"""Script to export every job as gzip-compressed NDJSON (one full Job document per line).
+
+Usage: python scripts/export_jobs.py jobs.ndjson.gz   (or ``-`` for stdout)
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.api.v1.jobs import stream_jobs_export
+
+
+async def export_jobs(path: str) -> None:
+    """Write the export stream to ``path`` chunk by chunk."""
+    output = sys.stdout.buffer if path == "-" else open(path, "wb")
+    try:
+        async for chunk in stream_jobs_export():
+            output.write(chunk)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python scripts/export_jobs.py <path|->")
+    asyncio.run(export_jobs(sys.argv[1]))
@@ -8,7 +8,9 @@ from datetime import datetime, timedelta, timezone
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app.database import SessionLocal, engine
-from app.models import Base, JobModel
+from app.facets import facet_deltas
+from app.geo import extract_points
+from app.models import Base, JobFacetCountModel, JobLocationModel, JobModel, JobsChangeCounterModel
 
 # Sample job data to seed the database
 SEED_JOBS = [
@@ -53,9 +55,16 @@ def seed_database():
             return
 
         print("Seeding database with initial job data...")
-        for job_data in SEED_JOBS:
-            job = JobModel(**job_data)
+        for change_seq, job_data in enumerate(SEED_JOBS, start=1):
+            job = JobModel(**job_data, change_seq=change_seq)
             db.add(job)
+            db.flush()
+            for latitude, longitude in extract_points(job.location):
+                db.add(JobLocationModel(job_id=job.id, latitude=latitude, longitude=longitude))
+
+        for (facet, value, closing_day), count in facet_deltas(new=SEED_JOBS).items():
+            db.add(JobFacetCountModel(facet=facet, value=value, closing_day=closing_day, count=count))
+        db.query(JobsChangeCounterModel).update({"value": len(SEED_JOBS)})
 
         db.commit()
         print(f"Successfully seeded {len(SEED_JOBS)} jobs!")
@@ -1,3 +1,6 @@
+import asyncio
+import base64
+import json
 import os
 from datetime import datetime, timedelta, timezone
 import pathlib
@@ -7,33 +10,58 @@ os.environ["DATABASE_URL"] = "sqlite:///./test_jobs.db"
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
 
 from fastapi.testclient import TestClient
+import httpx
 import pytest
 
-from app.database import Base, engine, get_db, SessionLocal
+from app.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine, get_async_db
 from app.main import app
-from app.api.v1.jobs import JobCreatePayload
-from app.queue import Operation, build_queue_message, get_queue_publisher
+from app.api.v1.jobs import (
+    JobCreatePayload,
+    JobUpdatePayload,
+    _normalize_payload,
+    _job_json,
+    _job_model_to_response,
+    _summaries_json,
+    _summary_row_to_response,
+)
+from app.cache import JobResponseCache, get_job_cache
+from app.health import HealthMonitor
+from app.metrics import DB_QUERIES_PER_REQUEST, QUEUE_PUBLISH_DURATION, QUEUE_PUBLISH_FAILURES, REQUEST_DURATION
+from app.models import JobModel, OutboxMessageModel
+from app.outbox import OutboxRelay
+from app.queue import Operation, SqsQueuePublisher, build_queue_message
 from jobs_data_contracts.jobs import models as dc_models
 
 
-def override_get_db():
-    db = SessionLocal()
-    try:
+async def override_get_async_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 client = TestClient(app)
 
 
 class StubQueuePublisher:
     def __init__(self):
         self.messages = []
+        self.batches = 0
 
     def send_job_message(self, job, operation):
-        self.messages.append(build_queue_message(job, operation))
+        self.send_message(build_queue_message(job, operation))
+
+    def send_message(self, message):
+        self.messages.append(message)
+
+    def send_message_batch(self, messages):
+        self.batches += 1
+        for message in messages:
+            self.send_message(message)
+        return list(range(len(messages)))
+
+
+def relay_outbox(publisher) -> int:
+    return asyncio.run(OutboxRelay(publisher).drain())
 
 
 def build_job_payload(external_id: str = "ext-1") -> dict:
@@ -63,10 +91,44 @@ def build_job_payload(external_id: str = "ext-1") -> dict:
     return validated.model_dump(by_alias=True, mode="json")
 
 
+def build_full_job_payload(external_id: str = "ext-full") -> dict:
+    """A payload with every optional field populated, for wire-format checks."""
+    payload = build_job_payload(external_id)
+    payload.update(
+        {
+            "title": "Ingénieur – Backend",
+            "contacts": [{"contactName": "Ada", "contactEmail": "ada@example.com", "contactPhone": "0100"}],
+            "nationalityRequirement": "UK nationals",
+            "summary": "Summary",
+            "applyUrl": "https://example.com/apply",
+            "benefits": "Pension",
+            "salary": {"minimum": 40000, "maximum": 50000.5, "currency": "GBP", "currencySymbol": "£"},
+            "jobNumbers": 2,
+            "successProfileDetails": "Behaviours",
+            "diversityStatement": "Diverse",
+            "disabilityConfident": "Yes",
+            "dcStatus": dc_models.DCStatus.committed.value,
+            "redeploymentScheme": "No",
+            "prisonScheme": "No",
+            "veteranScheme": "Yes",
+            "criminalRecordCheck": "Basic",
+            "complaintsInfo": "Complaints",
+            "workingForTheCivilService": "Great",
+            "eligibilityCheck": "BPSS",
+            "attachments": [{"href": "https://example.com/a.pdf", "docName": "Pack", "docFormat": "pdf"}],
+        }
+    )
+    payload["dateClosing"] = "2031-02-03T04:05:06.789000+00:00"
+    return JobCreatePayload.model_validate(payload).model_dump(by_alias=True, mode="json")
+
+
 @pytest.fixture(autouse=True)
 def setup_database():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Pooled async connections would otherwise carry a stale schema (and FTS5 state) into the test.
+    asyncio.run(async_engine.dispose())
+    get_job_cache().clear()
     yield
     Base.metadata.drop_all(bind=engine)
 
@@ -74,13 +136,11 @@ def setup_database():
 @pytest.fixture(autouse=True)
 def stub_queue_publisher(monkeypatch):
     stub = StubQueuePublisher()
-    app.dependency_overrides[get_queue_publisher] = lambda: stub
     message_version = "5"
     monkeypatch.setenv("QUEUE_MESSAGE_VERSION", message_version)
     monkeypatch.delenv("QUEUE_API_ENDPOINT", raising=False)
     stub.message_version = int(message_version)
-    yield stub
-    app.dependency_overrides.pop(get_queue_publisher, None)
+    return stub
 
 
 def test_create_job_and_get_summary_and_detail(stub_queue_publisher):
@@ -110,6 +170,8 @@ def test_create_job_and_get_summary_and_detail(stub_queue_publisher):
     assert detail["dateClosing"].startswith(payload["dateClosing"][:10])
     assert detail["datePosted"].startswith(payload["datePosted"][:10])
     assert detail["version"] == 1
+    assert stub_queue_publisher.messages == []
+    assert relay_outbox(stub_queue_publisher) == 1
     assert len(stub_queue_publisher.messages) == 1
     message = stub_queue_publisher.messages[0]
     assert message["id"] == data["id"]
@@ -126,6 +188,7 @@ def test_put_requires_matching_external_id(stub_queue_publisher):
     replace_payload = build_job_payload(external_id="other-id")
     replace = client.put("/jobs/ext-1", json=replace_payload)
     assert replace.status_code == 400
+    relay_outbox(stub_queue_publisher)
     assert len(stub_queue_publisher.messages) == 1
 
 
@@ -137,6 +200,7 @@ def test_patch_rejects_external_id_and_updates_fields(stub_queue_publisher):
     patch_payload = {"externalId": "new-id", "dateClosing": future_date}
     bad_patch = client.patch("/jobs/ext-1", json=patch_payload)
     assert bad_patch.status_code == 400
+    relay_outbox(stub_queue_publisher)
     assert len(stub_queue_publisher.messages) == 1
 
     patch_payload = {"dateClosing": future_date, "summary": "Updated"}
@@ -146,6 +210,7 @@ def test_patch_rejects_external_id_and_updates_fields(stub_queue_publisher):
     assert patched["dateClosing"].startswith(future_date[:10])
     assert patched["summary"] == "Updated"
     assert patched["version"] == 2
+    relay_outbox(stub_queue_publisher)
     assert len(stub_queue_publisher.messages) == 2
     assert stub_queue_publisher.messages[-1]["operation"] == Operation.UPDATE.value
     assert stub_queue_publisher.messages[-1]["version"] == stub_queue_publisher.message_version
@@ -165,5 +230,876 @@ def test_put_increments_version(stub_queue_publisher):
     replaced = replace.json()
     assert replaced["title"] == "Backend Engineer Updated"
     assert replaced["version"] == 2
+    relay_outbox(stub_queue_publisher)
     assert len(stub_queue_publisher.messages) == 2
     assert stub_queue_publisher.messages[-1]["operation"] == Operation.REPLACE.value
+
+
+def test_list_jobs_keyset_pagination():
+    for index in range(5):
+        payload = build_job_payload(external_id=f"ext-{index}")
+        payload["dateClosing"] = (datetime.now(timezone.utc) + timedelta(days=index + 1)).isoformat()
+        assert client.post("/jobs", json=payload).status_code == 201
+
+    seen = []
+    url = "/jobs?limit=2"
+    while url:
+        page = client.get(url)
+        assert page.status_code == 200
+        assert len(page.json()) <= 2
+        seen.extend(item["externalId"] for item in page.json())
+        next_link = page.links.get("next")
+        url = next_link["url"] if next_link else None
+
+    assert seen == [f"ext-{index}" for index in range(5)]
+
+    assert client.get("/jobs?cursor=not-a-cursor").status_code == 400
+    assert client.get("/jobs?limit=0").status_code == 400
+
+
+def test_list_jobs_filters_by_approach_and_date_closing():
+    now = datetime.now(timezone.utc)
+    for index, approach in enumerate(
+        [dc_models.Approach.external, dc_models.Approach.internal, dc_models.Approach.external]
+    ):
+        payload = build_job_payload(external_id=f"ext-{index}")
+        payload["approach"] = approach.value
+        payload["dateClosing"] = (now + timedelta(days=index * 10)).isoformat()
+        assert client.post("/jobs", json=payload).status_code == 201
+
+    external = client.get("/jobs", params={"approach": dc_models.Approach.external.value})
+    assert external.status_code == 200
+    assert [item["externalId"] for item in external.json()] == ["ext-0", "ext-2"]
+
+    open_external = client.get(
+        "/jobs",
+        params={"approach": dc_models.Approach.external.value, "dateClosing": (now + timedelta(days=5)).isoformat()},
+    )
+    assert [item["externalId"] for item in open_external.json()] == ["ext-2"]
+
+    assert client.get("/jobs", params={"approach": "Nobody"}).status_code == 400
+    assert client.get("/jobs", params={"dateClosing": "tomorrow"}).status_code == 400
+
+
+def test_search_ranks_matches_and_paginates():
+    jobs = {
+        "title-match": {"title": "Data Scientist"},
+        "summary-match": {"summary": "Join our data science team"},
+        "description-match": {"description": "Work alongside a scientist on data pipelines"},
+        "no-match": {},
+    }
+    for external_id, fields in jobs.items():
+        payload = build_job_payload(external_id)
+        payload.update(fields)
+        assert client.post("/jobs", json=payload).status_code == 201
+
+    response = client.get("/jobs/search", params={"q": "scientist"})
+    assert response.status_code == 200
+    assert [item["externalId"] for item in response.json()] == ["title-match", "description-match"]
+    assert set(response.json()[0]) == {"id", "version", "externalId", "title", "approach", "dateClosing"}
+
+    seen = []
+    url = "/jobs/search?q=data&limit=1"
+    while url:
+        page = client.get(url)
+        assert page.status_code == 200
+        seen.extend(item["externalId"] for item in page.json())
+        next_link = page.links.get("next")
+        url = next_link["url"] if next_link else None
+    assert seen[0] == "title-match"
+    assert sorted(seen) == ["description-match", "summary-match", "title-match"]
+
+    # The index follows writes.
+    assert client.patch("/jobs/no-match", json={"title": "Chief Scientist"}).status_code == 200
+    assert "no-match" in [item["externalId"] for item in client.get("/jobs/search?q=scientist").json()]
+
+    assert client.get("/jobs/search", params={"q": '"-*)'}).json() == []
+    assert client.get("/jobs/search?q=data&cursor=not-a-cursor").status_code == 400
+    assert client.get("/jobs/search").status_code == 400
+
+
+def test_nearby_jobs_are_ranked_by_distance_and_follow_location_writes():
+    places = {
+        "london": (51.5074, -0.1278),
+        "reading": (51.4543, -0.9781),
+        "bristol": (51.4545, -2.5879),
+        "edinburgh": (55.9533, -3.1883),
+    }
+    for external_id, (latitude, longitude) in places.items():
+        payload = build_job_payload(external_id)
+        payload["location"] = [{"townName": external_id.title(), "region": "UK", "latitude": latitude, "longitude": longitude}]
+        assert client.post("/jobs", json=payload).status_code == 201
+
+    near_london = {"latitude": 51.5, "longitude": -0.12}
+    response = client.get("/jobs/nearby", params={**near_london, "radiusKm": 200})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["externalId"] for item in body] == ["london", "reading", "bristol"]
+    assert body[0]["distanceKm"] < 1
+    assert 55 < body[1]["distanceKm"] < 65
+
+    seen = []
+    url = "/jobs/nearby?latitude=51.5&longitude=-0.12&radiusKm=200&limit=2"
+    while url:
+        page = client.get(url)
+        seen.extend(item["externalId"] for item in page.json())
+        next_link = page.links.get("next")
+        url = next_link["url"] if next_link else None
+    assert seen == ["london", "reading", "bristol"]
+
+    # Moving a job via PATCH (or PUT, or the batch upsert) moves its indexed point.
+    assert client.patch("/jobs/edinburgh", json={"location": [{"townName": "London", "region": "London", "latitude": 51.52, "longitude": -0.1}]}).status_code == 200
+    replaced = build_job_payload("london")
+    replaced["location"] = [{"townName": "Bristol", "region": "South West", "latitude": 51.45, "longitude": -2.59}]
+    assert client.put("/jobs/london", json=replaced).status_code == 200
+    upserted = build_job_payload("bristol")
+    upserted["location"] = [{"townName": "Edinburgh", "region": "Scotland", "latitude": 55.95, "longitude": -3.19}]
+    assert client.post("/jobs:batch?upsert=true", json=[upserted]).json()[0]["status"] == 200
+    nearby = client.get("/jobs/nearby", params={**near_london, "radiusKm": 100}).json()
+    assert [item["externalId"] for item in nearby] == ["edinburgh", "reading"]
+
+    # Jobs at the same distance page by id; the cursor is applied in SQL, so none is skipped or repeated.
+    for external_id in ("twin-a", "twin-b"):
+        payload = build_job_payload(external_id)
+        payload["location"] = [{"townName": "York", "region": "Yorkshire", "latitude": 53.96, "longitude": -1.08}]
+        assert client.post("/jobs", json=payload).status_code == 201
+    seen = []
+    url = "/jobs/nearby?latitude=53.96&longitude=-1.08&radiusKm=10&limit=1"
+    while url:
+        page = client.get(url)
+        seen.extend(item["externalId"] for item in page.json())
+        next_link = page.links.get("next")
+        url = next_link["url"] if next_link else None
+    assert sorted(seen) == ["twin-a", "twin-b"]
+
+    assert client.get("/jobs/nearby", params={"latitude": 91, "longitude": 0}).status_code == 400
+    assert client.get("/jobs/nearby", params={**near_london, "radiusKm": 5000}).status_code == 400
+
+
+def test_bounding_box_covers_the_radius_near_the_antimeridian():
+    from app.geo import bounding_box_clause, haversine_km
+
+    assert 343 < haversine_km(51.5074, -0.1278, 48.8566, 2.3522) < 345
+    clause = bounding_box_clause(-17.7, 179.9, 50)
+    compiled = str(clause.compile(compile_kwargs={"literal_binds": True}))
+    assert " OR " in compiled  # the box wraps around to negative longitudes
+
+
+def test_facet_counts_follow_writes_and_exclude_closed_jobs(stub_queue_publisher):
+    from app.facets import rebuild_facet_counts
+
+    def counts(facet):
+        return {item["value"]: item["count"] for item in client.get("/jobs/facets").json()[facet]}
+
+    for external_id in ("a", "b", "c"):
+        assert client.post("/jobs", json=build_job_payload(external_id)).status_code == 201
+    closed = build_job_payload("closed")
+    closed["organisation"] = "HM Treasury"
+    closed["dateClosing"] = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    assert client.post("/jobs", json=closed).status_code == 201
+    assert counts("organisation") == {"Cabinet Office": 3}
+
+    moved = build_job_payload("a")
+    moved["organisation"] = "Home Office"
+    assert client.put("/jobs/a", json=moved).status_code == 200
+    assert client.patch("/jobs/b", json={"grade": dc_models.Grade.grade_6.value}).status_code == 200
+    upserted = build_job_payload("c")
+    upserted["organisation"] = "Home Office"
+    assert client.post("/jobs:batch?upsert=true", json=[upserted]).json()[0]["status"] == 200
+    expected = {"Home Office": 2, "Cabinet Office": 1}
+    assert counts("organisation") == expected
+    assert counts("grade") == {dc_models.Grade.grade_7.value: 2, dc_models.Grade.grade_6.value: 1}
+    assert list(counts("organisation")) == ["Home Office", "Cabinet Office"]
+
+    # On Postgres the replaced values come back from the UPDATE, which locks the row through its FROM subquery.
+    from sqlalchemy.dialects import postgresql
+
+    from app.api.v1.jobs import _update_statement
+
+    statement = _update_statement("postgresql", "a", {"grade": "x"}, old_facets=True)
+    update_sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE" in update_sql
+    assert '"old".organisation AS old_organisation' in update_sql.split("RETURNING")[1]
+
+    # Drift (e.g. a manual SQL edit) is repaired by the rebuild command.
+    with SessionLocal() as session:
+        session.query(JobModel).filter(JobModel.external_id == "b").update({"organisation": "Ministry of Justice"})
+        session.commit()
+
+    async def rebuild():
+        async with AsyncSessionLocal() as db:
+            await rebuild_facet_counts(db)
+
+    asyncio.run(rebuild())
+    asyncio.run(async_engine.dispose())
+    assert counts("organisation") == {"Home Office": 2, "Ministry of Justice": 1}
+
+
+def test_facet_day_buckets_agree_across_write_paths_for_offset_closing_dates(stub_queue_publisher):
+    from app.models import JobFacetCountModel
+
+    # 02:00 at +05:00 is still the previous day in UTC.
+    payload = build_job_payload("offset")
+    payload["dateClosing"] = "2030-01-01T02:00:00+05:00"
+    assert client.post("/jobs:batch", json=[payload]).json()[0]["status"] == 201
+    assert client.get("/jobs/offset").json()["dateClosing"] == "2029-12-31T21:00:00Z"
+    payload["organisation"] = "Home Office"
+    assert client.put("/jobs/offset", json=payload).status_code == 200
+
+    with SessionLocal() as session:
+        counters = session.query(JobFacetCountModel).filter(JobFacetCountModel.count != 0).all()
+    assert {(counter.facet, counter.value) for counter in counters if counter.facet == "organisation"} == {
+        ("organisation", "Home Office")
+    }
+    assert {str(counter.closing_day) for counter in counters} == {"2029-12-31"}
+
+
+def test_change_feed_returns_each_job_once_in_change_order(stub_queue_publisher):
+    for external_id in ("a", "b", "c"):
+        assert client.post("/jobs", json=build_job_payload(external_id)).status_code == 201
+    assert client.patch("/jobs/a", json={"title": "Staff Engineer"}).status_code == 200
+    batch = [build_job_payload("b"), build_job_payload("d")]
+    assert [item["status"] for item in client.post("/jobs:batch?upsert=true", json=batch).json()] == [200, 201]
+
+    changes = client.get("/jobs/changes").json()
+    assert [job["externalId"] for job in changes] == ["c", "a", "b", "d"]
+    assert changes[1]["title"] == "Staff Engineer"
+    sequences = [job["changeSeq"] for job in changes]
+    assert sequences == sorted(sequences)
+
+    # A consumer that stored its position only pulls what changed after it.
+    since = sequences[1]
+    assert [job["externalId"] for job in client.get(f"/jobs/changes?since={since}").json()] == ["b", "d"]
+    assert client.put("/jobs/c", json=build_job_payload("c")).status_code == 200
+    seen = []
+    url = f"/jobs/changes?since={since}&limit=2"
+    while url:
+        page = client.get(url)
+        seen.extend(job["externalId"] for job in page.json())
+        next_link = page.links.get("next")
+        url = next_link["url"] if next_link else None
+    assert seen == ["b", "d", "c"]
+    assert client.get(f"/jobs/changes?since={sequences[-1] + 1}").json() == []
+
+    # On Postgres, changes of transactions newer than the oldest one still running are held back.
+    from types import SimpleNamespace
+
+    from sqlalchemy.dialects import postgresql
+
+    from app.changes import next_change_seq, visible_changes
+
+    postgres_session = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+    horizon = visible_changes(postgres_session, JobModel.change_seq).compile(dialect=postgresql.dialect())
+    assert "pg_snapshot_xmin(pg_current_snapshot())" in str(horizon)
+    # The session has no execute(): the value is computed by the write statement itself.
+    stamp = asyncio.run(next_change_seq(postgres_session)).compile(dialect=postgresql.dialect())
+    assert "pg_current_xact_id()" in str(stamp)
+
+
+def test_export_streams_every_full_document_as_gzip_ndjson(stub_queue_publisher):
+    import gzip
+
+    for external_id in ("a", "b", "c"):
+        assert client.post("/jobs", json=build_full_job_payload(external_id)).status_code == 201
+
+    response = client.get("/jobs:export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    lines = gzip.decompress(response.content).decode().splitlines()
+    exported = {json.loads(line)["externalId"]: json.loads(line) for line in lines}
+    assert sorted(exported) == ["a", "b", "c"]
+    for external_id, document in exported.items():
+        assert document == client.get(f"/jobs/{external_id}").json()
+
+
+def test_closed_jobs_are_archived_but_stay_readable_by_external_id(stub_queue_publisher):
+    import gzip
+
+    from app.archive import archive_closed_jobs
+    from app.models import JobArchiveModel, JobLocationModel
+
+    closed = build_job_payload("closed")
+    closed["dateClosing"] = (datetime.now(timezone.utc) - timedelta(days=40)).isoformat()
+    closed["location"] = [{"townName": "London", "region": "London", "latitude": 51.5, "longitude": -0.12}]
+    assert client.post("/jobs", json=closed).status_code == 201
+    assert client.post("/jobs", json=build_job_payload("open")).status_code == 201
+    before = client.get("/jobs/closed")
+    list_etag = client.get("/jobs").headers["ETag"]
+    synced_to = client.get("/jobs/changes").json()[-1]["changeSeq"]
+
+    async def sweep():
+        async with AsyncSessionLocal() as db:
+            return await archive_closed_jobs(db, batch_size=1)
+
+    assert asyncio.run(sweep()) == 1
+    assert asyncio.run(sweep()) == 0
+    asyncio.run(async_engine.dispose())
+    with SessionLocal() as session:
+        assert [job.external_id for job in session.query(JobModel)] == ["open"]
+        assert [job.external_id for job in session.query(JobArchiveModel)] == ["closed"]
+        assert session.query(JobLocationModel).filter(JobLocationModel.job_id == before.json()["id"]).count() == 0
+
+    # The hot table no longer lists it, but reads by externalId fall back to the archive.
+    assert client.get("/jobs").headers["ETag"] != list_etag
+    nearby = client.get("/jobs/nearby", params={"latitude": 51.5, "longitude": -0.12}).json()
+    assert [item["externalId"] for item in nearby] == ["open"]
+    archived = client.get("/jobs/closed")
+    assert archived.status_code == 200
+    assert archived.json() == before.json()
+    assert archived.headers["ETag"] == before.headers["ETag"]
+    assert client.get("/jobs/closed", headers={"If-None-Match": before.headers["ETag"]}).status_code == 304
+    assert client.get("/jobs/closed?fields=title").json() == {"title": closed["title"]}
+    assert client.patch("/jobs/closed", json={"title": "Reopened"}).status_code == 404
+
+    lines = gzip.decompress(client.get("/jobs:export").content).decode().splitlines()
+    assert sorted(json.loads(line)["externalId"] for line in lines) == ["closed", "open"]
+
+    # A consumer of the change feed learns about the move through a tombstone.
+    tombstones = client.get(f"/jobs/changes?since={synced_to}").json()
+    assert [(job["externalId"], job["archived"]) for job in tombstones] == [("closed", True)]
+    assert tombstones[0]["title"] == closed["title"]
+    replay = client.get("/jobs/changes").json()
+    assert [(job["externalId"], job["archived"]) for job in replay] == [("open", False), ("closed", True)]
+
+    # Posting the externalId again creates a live job, which replaces the cached archived one.
+    assert client.get("/jobs/closed").json()["id"] == before.json()["id"]
+    recreated = client.post("/jobs", json=build_job_payload("closed"))
+    assert recreated.json()["id"] != before.json()["id"]
+    live = client.get("/jobs/closed")
+    assert live.json() == recreated.json()
+    assert live.headers["ETag"] == recreated.headers["ETag"]
+    assert client.get("/jobs/closed").json() == recreated.json()  # now served from the cache
+
+
+def test_sparse_fieldsets_select_only_requested_columns(stub_queue_publisher):
+    from sqlalchemy import event
+
+    full = client.post("/jobs", json=build_full_job_payload("ext-full")).json()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        detail = client.get("/jobs/ext-full?fields=title,salary,location,dateClosing")
+        page = client.get("/jobs?fields=title,salary")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert detail.status_code == 200
+    assert detail.json() == {key: full[key] for key in ("title", "location", "dateClosing", "salary")}
+    assert detail.headers["ETag"] == f'"{full["id"]}.{full["version"]}"'
+    assert page.json() == [{"title": full["title"], "salary": full["salary"]}]
+    job_selects = [statement for statement in statements if "FROM jobs" in statement]
+    assert job_selects and not any("description" in statement for statement in job_selects)
+
+    assert client.get("/jobs/ext-full?fields=title,bogus").status_code == 400
+    assert client.get("/jobs?fields=personal_spec").status_code == 400
+    assert client.get("/jobs/ext-full?fields=,").status_code == 400
+
+
+def test_unchanged_writes_skip_version_bump_and_queue_message(stub_queue_publisher):
+    payload = build_full_job_payload("ext-full")
+    created = client.post("/jobs", json=payload)
+    changes_before = client.get("/jobs/changes").json()
+
+    resent = client.put("/jobs/ext-full", json=payload)
+    assert resent.status_code == 200
+    assert resent.json() == created.json()
+    assert resent.headers["ETag"] == created.headers["ETag"]
+    assert client.patch("/jobs/ext-full", json={"title": payload["title"]}).json()["version"] == 1
+    upserted = client.post("/jobs:batch?upsert=true", json=[payload]).json()
+    assert upserted[0]["status"] == 200 and upserted[0]["version"] == 1
+    with SessionLocal() as db:
+        assert db.query(OutboxMessageModel).count() == 1
+    assert client.get("/jobs/changes").json() == changes_before
+
+    # A stale If-Match still fails, even though nothing would change.
+    assert client.put("/jobs/ext-full", json=payload, headers={"If-Match": '"stale.0"'}).status_code == 412
+
+    # A real change is written, and the PATCHed job is then compared column by column.
+    assert client.patch("/jobs/ext-full", json={"title": "Changed"}).json()["version"] == 2
+    assert client.patch("/jobs/ext-full", json={"title": "Changed"}).json()["version"] == 2
+    assert client.put("/jobs/ext-full", json=payload).json()["version"] == 3
+    assert client.put("/jobs/ext-full", json=payload).json()["version"] == 3
+
+
+COLD_START_SCRIPT = """
+import asyncio, json, sqlite3, sys, time
+from app.main import app
+from app.metrics import DB_QUERY_DURATION
+
+async def boot():
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        return time.perf_counter() - started
+
+startup_seconds = asyncio.run(boot())
+tables = sqlite3.connect(sys.argv[1]).execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+print(json.dumps({
+    "startup_seconds": startup_seconds,
+    "statements": {label: DB_QUERY_DURATION.count(label) for label in ("sync", "async")},
+    "boto3_imported": "boto3" in sys.modules,
+    "tables": [name for (name,) in tables],
+}))
+"""
+# Startup takes milliseconds; the budget is loose so only a real regression (e.g. create_all creeping back) trips it.
+COLD_START_BUDGET_SECONDS = 2.0
+
+
+def test_cold_start_checks_schema_revision_without_create_all_or_boto3(tmp_path):
+    import sqlite3
+    import subprocess
+
+    from app.startup import check_schema_revision
+
+    database = tmp_path / "cold.db"
+    with sqlite3.connect(database) as connection:
+        connection.execute("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)")
+        connection.execute("INSERT INTO alembic_version VALUES ('test-head')")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "SCHEMA_STARTUP_MODE": "check",
+        "SCHEMA_REVISION": "test-head",
+        "DB_POOL_PREWARM": "2",
+        "OUTBOX_RELAY_ENABLED": "false",
+    }
+    env.pop("SQS_QUEUE_URL", None)
+    env.pop("SQS_QUEUE_NAME", None)
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START_SCRIPT, str(database)],
+        cwd=pathlib.Path(__file__).resolve().parents[1],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.splitlines()[-1])
+    assert report["tables"] == ["alembic_version"]  # create_all did not run
+    assert not report["boto3_imported"]
+    # Startup's only statement is the alembic_version read; a slow step shows up here first.
+    assert report["statements"] == {"sync": 0, "async": 1}
+    assert report["startup_seconds"] < COLD_START_BUDGET_SECONDS
+
+    # The test database is built by create_all, so it has no Alembic revision to match.
+    with pytest.raises(RuntimeError, match="alembic"):
+        asyncio.run(check_schema_revision())
+
+
+def test_job_ids_are_time_ordered_uuids_in_the_usual_string_form(stub_queue_publisher):
+    import uuid
+
+    ids = [client.post("/jobs", json=build_job_payload(f"ext-{n}")).json()["id"] for n in range(3)]
+    ids += [item["id"] for item in client.post("/jobs:batch", json=[build_job_payload("ext-batch")]).json()]
+    for job_id in ids:
+        assert str(uuid.UUID(job_id)) == job_id
+        assert uuid.UUID(job_id).version == 7
+    assert [job_id[:13] for job_id in ids] == sorted(job_id[:13] for job_id in ids)  # millisecond prefix
+    assert client.get("/jobs/ext-0").json()["id"] == ids[0]
+
+    # Malformed ids in client-supplied tokens are rejected, never sent to the uuid column.
+    assert client.put("/jobs/ext-0", json=build_job_payload("ext-0"), headers={"If-Match": '"not-a-uuid.1"'}).status_code == 412
+    bad_cursor = base64.urlsafe_b64encode(json.dumps(["2030-01-01T00:00:00+00:00", "nope"]).encode()).decode()
+    assert client.get(f"/jobs?cursor={bad_cursor}").status_code == 400
+
+
+def test_list_jobs_streams_ndjson():
+    for index in range(3):
+        payload = build_job_payload(external_id=f"ext-{index}")
+        payload["dateClosing"] = (datetime.now(timezone.utc) + timedelta(days=index + 1)).isoformat()
+        assert client.post("/jobs", json=payload).status_code == 201
+
+    response = client.get("/jobs?limit=1", headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "link" not in response.headers
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["externalId"] for line in lines] == ["ext-0", "ext-1", "ext-2"]
+    assert lines == client.get("/jobs").json()
+
+
+def test_job_routes_serve_concurrent_requests_on_one_event_loop():
+    assert client.post("/jobs", json=build_job_payload()).status_code == 201
+
+    async def fetch_concurrently():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(*(async_client.get("/jobs/ext-1") for _ in range(50)))
+
+    responses = asyncio.run(fetch_concurrently())
+    assert {response.status_code for response in responses} == {200}
+    assert {response.json()["externalId"] for response in responses} == {"ext-1"}
+
+
+def test_outbox_keeps_messages_until_the_queue_accepts_them(stub_queue_publisher):
+    class FailingQueuePublisher(StubQueuePublisher):
+        def send_message(self, message):
+            raise RuntimeError("queue unavailable")
+
+    assert client.post("/jobs", json=build_job_payload("ext-1")).status_code == 201
+    assert client.post("/jobs", json=build_job_payload("ext-2")).status_code == 201
+
+    assert relay_outbox(FailingQueuePublisher()) == 0
+    with SessionLocal() as db:
+        assert db.query(OutboxMessageModel).count() == 2
+
+    assert relay_outbox(stub_queue_publisher) == 2
+    assert [message["externalId"] for message in stub_queue_publisher.messages] == ["ext-1", "ext-2"]
+    with SessionLocal() as db:
+        assert db.query(OutboxMessageModel).count() == 0
+
+
+def test_outbox_relay_coalesces_repeated_updates_into_one_batch(stub_queue_publisher):
+    assert client.post("/jobs", json=build_job_payload()).status_code == 201
+    for summary in ("First", "Second", "Third"):
+        assert client.patch("/jobs/ext-1", json={"summary": summary}).status_code == 200
+    replacement = build_job_payload()
+    replacement["title"] = "Replaced"
+    assert client.put("/jobs/ext-1", json=replacement).status_code == 200
+
+    assert relay_outbox(stub_queue_publisher) == 5
+    assert stub_queue_publisher.batches == 1
+    assert [message["operation"] for message in stub_queue_publisher.messages] == [
+        Operation.CREATE.value,
+        Operation.REPLACE.value,
+    ]
+    with SessionLocal() as db:
+        assert db.query(OutboxMessageModel).count() == 0
+
+
+def test_sqs_publisher_sends_batches_of_ten_and_reports_accepted_entries():
+    class FakeSqsClient:
+        def __init__(self):
+            self.calls = []
+
+        def send_message_batch(self, QueueUrl, Entries):
+            self.calls.append([json.loads(entry["MessageBody"])["n"] for entry in Entries])
+            # The queue rejects the very last entry of the whole batch.
+            return {
+                "Successful": [{"Id": entry["Id"]} for entry in Entries if entry["Id"] != "22"],
+                "Failed": [{"Id": entry["Id"]} for entry in Entries if entry["Id"] == "22"],
+            }
+
+    publisher = SqsQueuePublisher(queue_url="https://sqs.test/queue", queue_name=None, endpoint_url=None, region_name=None)
+    publisher.client = FakeSqsClient()
+    failures_before = QUEUE_PUBLISH_FAILURES.value("send_message_batch")
+    calls_before = QUEUE_PUBLISH_DURATION.count("send_message_batch")
+
+    sent = publisher.send_message_batch([{"n": n} for n in range(23)])
+
+    assert [len(call) for call in publisher.client.calls] == [10, 10, 3]
+    assert sent == list(range(22))
+    assert QUEUE_PUBLISH_DURATION.count("send_message_batch") == calls_before + 3
+    assert QUEUE_PUBLISH_FAILURES.value("send_message_batch") == failures_before + 1
+
+
+def test_metrics_endpoint_exports_route_and_db_metrics(stub_queue_publisher):
+    detail_before = REQUEST_DURATION.count("GET", "/jobs/{external_id}")
+    queries_before = DB_QUERIES_PER_REQUEST.sum("POST", "/jobs")
+    assert client.post("/jobs", json=build_job_payload("metrics-1")).status_code == 201
+    get_job_cache().clear()
+    assert client.get("/jobs/metrics-1").status_code == 200
+    assert client.get("/jobs/missing").status_code == 404
+
+    # Labelled by route template, so both lookups share one series.
+    assert REQUEST_DURATION.count("GET", "/jobs/{external_id}") == detail_before + 2
+    # change_seq, the job, its location, its facet counts and the outbox event.
+    assert DB_QUERIES_PER_REQUEST.sum("POST", "/jobs") - queries_before == 5
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'jobs_api_requests_total{method="GET",route="/jobs/{external_id}",status="404"}' in body
+    assert 'jobs_api_request_duration_seconds_bucket{method="POST",route="/jobs",le="+Inf"}' in body
+    assert 'jobs_api_db_query_duration_seconds_count{engine="async"}' in body
+    assert 'jobs_api_db_pool_checked_out{engine="async"}' in body
+    assert "jobs_api_db_pool_wait_seconds_count" in body
+
+
+def test_readiness_reports_cached_checks_and_pool_saturation(monkeypatch):
+    class FailingQueue:
+        def check(self):
+            raise RuntimeError("queue unreachable")
+
+    monitor = HealthMonitor(engine=async_engine, interval=5, timeout=1)
+    monkeypatch.setattr("app.health._health_monitor", monitor)
+
+    # Nothing checked yet: alive, but not ready.
+    assert client.get("/health").json() == {"status": "ok", "db": "unknown"}
+    assert client.get("/health/ready").status_code == 503
+
+    asyncio.run(monitor.refresh())
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["db"] == "ok" and body["queue"] == "disabled"
+    assert body["pool"]["size"] == 10 and 0 <= body["pool"]["saturation"] < 1
+    assert client.get("/health").json()["db"] == "ok"
+
+    failing = HealthMonitor(engine=async_engine, publisher=FailingQueue(), interval=5, timeout=1)
+    asyncio.run(failing.refresh())
+    assert failing.readiness()["queue"] == "unavailable"
+    assert failing.readiness()["status"] == "unavailable"
+
+    saturated = HealthMonitor(engine=async_engine, interval=5, timeout=1, max_pool_saturation=0)
+    asyncio.run(saturated.refresh())
+    assert saturated.readiness()["status"] == "unavailable"
+
+
+def test_batch_create_reports_per_item_status(stub_queue_publisher):
+    assert client.post("/jobs", json=build_job_payload("existing")).status_code == 201
+    invalid = build_job_payload("invalid")
+    del invalid["title"]
+
+    response = client.post(
+        "/jobs:batch",
+        json=[build_job_payload("new-1"), build_job_payload("existing"), invalid, build_job_payload("new-2"), build_job_payload("new-1")],
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert [(result["index"], result["status"]) for result in results] == [(0, 201), (1, 409), (2, 400), (3, 201), (4, 409)]
+    assert results[0]["externalId"] == "new-1"
+    assert results[0]["version"] == 1
+    assert client.get("/jobs/new-2").status_code == 200
+
+    relay_outbox(stub_queue_publisher)
+    assert sorted(
+        message["externalId"] for message in stub_queue_publisher.messages if message["operation"] == Operation.CREATE.value
+    ) == ["existing", "new-1", "new-2"]
+
+
+def test_batch_upsert_replaces_existing_jobs(stub_queue_publisher):
+    assert client.post("/jobs", json=build_job_payload("existing")).status_code == 201
+    replacement = build_job_payload("existing")
+    replacement["title"] = "Replaced in bulk"
+
+    response = client.post("/jobs:batch?upsert=true", json=[replacement, build_job_payload("new-1")])
+    assert response.status_code == 200
+    assert [(result["externalId"], result["status"], result["version"]) for result in response.json()] == [
+        ("existing", 200, 2),
+        ("new-1", 201, 1),
+    ]
+    detail = client.get("/jobs/existing").json()
+    assert detail["title"] == "Replaced in bulk"
+    assert detail["version"] == 2
+
+    relay_outbox(stub_queue_publisher)
+    assert sorted((message["externalId"], message["operation"]) for message in stub_queue_publisher.messages[1:]) == [
+        ("existing", Operation.REPLACE.value),
+        ("new-1", Operation.CREATE.value),
+    ]
+
+
+def test_batch_upsert_retries_when_a_job_appears_after_its_locking_read(stub_queue_publisher, monkeypatch):
+    from app.api.v1 import jobs as jobs_module
+
+    assert client.post("/jobs", json=build_job_payload("raced")).status_code == 201
+    lock_existing = jobs_module._lock_existing_jobs
+    reads = []
+
+    async def read_before_concurrent_create(db, external_ids):
+        reads.append(list(external_ids))
+        # The first read behaves as if "raced" were created just after it.
+        return {} if len(reads) == 1 else await lock_existing(db, external_ids)
+
+    monkeypatch.setattr(jobs_module, "_lock_existing_jobs", read_before_concurrent_create)
+    replacement = build_job_payload("raced")
+    replacement["organisation"] = "Home Office"
+    response = client.post("/jobs:batch?upsert=true", json=[replacement])
+    assert [(item["status"], item["version"]) for item in response.json()] == [(200, 2)]
+    assert len(reads) == 2
+
+    facets = client.get("/jobs/facets").json()["organisation"]
+    assert facets == [{"value": "Home Office", "count": 1}]
+    relay_outbox(stub_queue_publisher)
+    assert [message["operation"] for message in stub_queue_publisher.messages] == [
+        Operation.CREATE.value,
+        Operation.REPLACE.value,
+    ]
+
+
+def test_job_detail_etag_and_conditional_requests(stub_queue_publisher):
+    created = client.post("/jobs", json=build_job_payload())
+    etag = created.headers["ETag"]
+
+    detail = client.get("/jobs/ext-1")
+    assert detail.headers["ETag"] == etag
+    not_modified = client.get("/jobs/ext-1", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    assert not_modified.content == b""
+
+    stale_patch = client.patch("/jobs/ext-1", json={"summary": "Stale"}, headers={"If-Match": '"other.1"'})
+    assert stale_patch.status_code == 412
+
+    patched = client.patch("/jobs/ext-1", json={"summary": "Fresh"}, headers={"If-Match": etag})
+    assert patched.status_code == 200
+    assert patched.headers["ETag"] != etag
+    assert client.get("/jobs/ext-1", headers={"If-None-Match": etag}).status_code == 200
+
+    replacement = build_job_payload()
+    assert client.put("/jobs/ext-1", json=replacement, headers={"If-Match": etag}).status_code == 412
+    assert client.put("/jobs/ext-1", json=replacement, headers={"If-Match": patched.headers["ETag"]}).status_code == 200
+
+
+def test_job_list_etag_changes_when_the_page_changes(stub_queue_publisher):
+    client.post("/jobs", json=build_job_payload())
+    listing = client.get("/jobs")
+    etag = listing.headers["ETag"]
+    assert client.get("/jobs", headers={"If-None-Match": etag}).status_code == 304
+
+    client.patch("/jobs/ext-1", json={"summary": "Changed"})
+    changed = client.get("/jobs", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+    # The ETag covers one page: a write to a job on a later page leaves it alone, a next page does not.
+    later = build_job_payload("ext-later")
+    later["dateClosing"] = "2040-01-01T00:00:00Z"
+    first_page = client.get("/jobs?limit=1").headers["ETag"]
+    client.post("/jobs", json=later)
+    assert client.get("/jobs?limit=1", headers={"If-None-Match": first_page}).status_code == 200
+    first_page = client.get("/jobs?limit=1").headers["ETag"]
+    client.patch("/jobs/ext-later", json={"summary": "Changed"})
+    assert client.get("/jobs?limit=1", headers={"If-None-Match": first_page}).status_code == 304
+
+
+def test_job_detail_is_served_from_cache_until_written(stub_queue_publisher):
+    client.post("/jobs", json=build_job_payload())
+
+    first = client.get("/jobs/ext-1")
+    second = client.get("/jobs/ext-1")
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert client.get("/jobs/ext-1", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+    stats = client.get("/cache/stats").json()["jobDetail"]
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+    client.patch("/jobs/ext-1", json={"summary": "Changed"})
+    after_write = client.get("/jobs/ext-1").json()
+    assert after_write["summary"] == "Changed"
+    assert after_write["version"] == 2
+    assert client.get("/cache/stats").json()["jobDetail"]["misses"] == 2
+
+
+def test_job_cache_is_bounded_and_ignores_older_versions():
+    cache = JobResponseCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", "id-a", 1, '"a.1"', b"a1")
+    cache.put("b", "id-b", 1, '"b.1"', b"b1")
+    cache.put("c", "id-c", 1, '"c.1"', b"c1")
+    assert cache.get("a") is None
+    assert cache.get("c").body == b"c1"
+
+    cache.invalidate("c", "id-c", 2)
+    cache.put("c", "id-c", 1, '"c.1"', b"stale")
+    assert cache.get("c") is None
+    cache.put("c", "id-c", 2, '"c.2"', b"c2")
+    assert cache.get("c").body == b"c2"
+
+    # A job recreated under the same externalId starts again at version 1.
+    cache.invalidate("c", "id-new", 1)
+    cache.put("c", "id-c", 2, '"c.2"', b"replaced")
+    assert cache.get("c") is None
+    cache.put("c", "id-new", 1, '"new.1"', b"new1")
+    assert cache.get("c").body == b"new1"
+
+
+def test_job_cache_stops_guarding_an_entry_once_it_expires(monkeypatch):
+    from types import SimpleNamespace
+
+    clock = [0.0]
+    monkeypatch.setattr("app.cache.time", SimpleNamespace(monotonic=lambda: clock[0]))
+    cache = JobResponseCache(max_entries=2, ttl_seconds=60)
+    cache.put("c", "id-archived", 3, '"archived.3"', b"archived")
+    cache.put("c", "id-new", 1, '"new.1"', b"new1")
+    assert cache.get("c").body == b"archived"
+
+    clock[0] = 61.0
+    cache.put("c", "id-new", 1, '"new.1"', b"new1")
+    assert cache.get("c").body == b"new1"
+
+
+def test_fast_json_encoding_matches_validated_response_models():
+    for payload in (build_job_payload(), build_full_job_payload()):
+        assert client.post("/jobs", json=payload).status_code == 201
+
+    with SessionLocal() as db:
+        jobs = db.query(JobModel).order_by(JobModel.closing_date, JobModel.id).all()
+        for job in jobs:
+            reference = _job_model_to_response(job).model_dump_json(by_alias=True)
+            assert json.loads(_job_json(job)) == json.loads(reference)
+        assert json.loads(_summaries_json(jobs)) == [
+            _summary_row_to_response(job).model_dump(mode="json", by_alias=True) for job in jobs
+        ]
+
+    detail = client.get("/jobs/ext-full")
+    assert detail.headers["content-type"] == "application/json"
+    assert detail.json()["dateClosing"] == "2031-02-03T04:05:06.789000Z"
+    assert detail.json()["salary"]["currencySymbol"] == "£"
+    assert detail.json()["applyUrl"] == "https://example.com/apply"
+
+
+def test_duplicate_external_id_is_recognised_by_constraint_name():
+    from types import SimpleNamespace
+
+    from sqlalchemy.exc import IntegrityError
+
+    from app.api.v1.jobs import _violated_constraint
+
+    def integrity_error(orig):
+        return IntegrityError("INSERT INTO jobs ...", {}, orig)
+
+    unique_violation = Exception("duplicate key value violates unique constraint")
+    unique_violation.constraint_name = "ix_jobs_external_id"
+    asyncpg_error = Exception("duplicate key value violates unique constraint")
+    asyncpg_error.__cause__ = unique_violation
+    assert _violated_constraint(integrity_error(asyncpg_error)) == "ix_jobs_external_id"
+    psycopg_error = Exception("doppelter Schlüsselwert verletzt Unique-Constraint")
+    psycopg_error.diag = SimpleNamespace(constraint_name="uq_jobs_external_id")
+    assert _violated_constraint(integrity_error(psycopg_error)) == "uq_jobs_external_id"
+    assert _violated_constraint(integrity_error(Exception("external_id is mentioned, but no constraint"))) is None
+
+
+def test_concurrent_patches_do_not_lose_version_increments(stub_queue_publisher):
+    assert client.post("/jobs", json=build_job_payload()).status_code == 201
+    assert client.post("/jobs", json=build_job_payload()).status_code == 409
+
+    async def patch_concurrently():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(
+                *(async_client.patch("/jobs/ext-1", json={"summary": f"Update {n}"}) for n in range(10))
+            )
+
+    responses = asyncio.run(patch_concurrently())
+    assert {response.status_code for response in responses} == {200}
+    assert sorted(response.json()["version"] for response in responses) == list(range(2, 12))
+    assert client.get("/jobs/ext-1").json()["version"] == 11
+    assert client.patch("/jobs/missing", json={"summary": "x"}).status_code == 404
+
+
+def test_normalize_payload_produces_plain_column_values():
+    payload = JobCreatePayload.model_validate(build_full_job_payload())
+    normalized = _normalize_payload(payload)
+
+    assert normalized["external_id"] == "ext-full"
+    assert normalized["approach"] == dc_models.Approach.external.value
+    assert normalized["assignment_type"] == dc_models.Assignments.permanent.value
+    assert normalized["dc_status"] == dc_models.DCStatus.committed.value
+    assert normalized["apply_url"] == "https://example.com/apply"
+    assert normalized["location"][0]["townName"] == "London"
+    assert normalized["contacts"][0]["contactEmail"] == "ada@example.com"
+    assert normalized["attachments"][0]["docName"] == "Pack"
+    assert isinstance(normalized["closing_date"], datetime)
+    assert isinstance(normalized["date_posted"], datetime)
+    assert "dateClosing" not in normalized
+
+    update = JobUpdatePayload.model_validate({"summary": "Only this", "dateClosing": "2031-01-01T00:00:00Z"})
+    assert _normalize_payload(update, exclude_unset=True) == {
+        "summary": "Only this",
+        "closing_date": datetime(2031, 1, 1, tzinfo=timezone.utc),
+    }